@@ -0,0 +1,180 @@
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+
+import requests
+
+# Aşırı yük belirtisi sayılan yanıt kodları (429 ve 5xx) ve istisnalar
+OVERLOAD_STATUSES = frozenset({429}) | frozenset(range(500, 600))
+OVERLOAD_ERRORS = (requests.Timeout,)
+
+logger = logging.getLogger("AdaptiveConcurrency")
+
+
+def overloaded(status, error=None, statuses=OVERLOAD_STATUSES, errors=OVERLOAD_ERRORS):
+    """Yanıt sunucunun zorlandığını mı gösteriyor (varsayılan: 429/5xx veya zaman aşımı)"""
+    if error is not None:
+        return isinstance(error, errors)
+    return status in statuses
+
+
+def percentile(values, fraction):
+    """Sıralanmamış değerlerin yüzdelik değeri (en yakın sıra yöntemi)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class AimdController:
+    """
+    Gecikme ve hata oranına göre eşzamanlılık limitini ayarlayan AIMD denetleyicisi.
+
+    Her `window` istekte bir karar verilir: p95 gecikme `target_p95` altında ve 429/5xx oranı
+    `max_error_rate` altındaysa (ve limit gerçekten doluysa) limit `increase` kadar artar; biri
+    aşılırsa limit `decrease` ile çarpılır. 429 alındığında pencere beklenmeden hemen azaltılır
+    (ardışık azaltmalar arasında en az `cooldown` saniye). İş parçacığı güvenlidir.
+
+    Hata sayılan yanıt kodları ve istisnalar `overload_statuses` ve `overload_errors` ile daraltılabilir.
+    Hata sayılmayan istisnalarla biten istekler hiç örneklenmez (süreleri gecikmeye de katılmaz); böylece
+    birçok farklı sunucuyu kapsayan bir denetleyici tek tek ölü sitelerin zaman aşımlarıyla küçülmez.
+    """
+
+    def __init__(self, name, initial, minimum=1, maximum=64, target_p95=5.0, max_error_rate=0.05,
+                 window=20, increase=1, decrease=0.5, cooldown=5.0, on_change=None,
+                 overload_statuses=OVERLOAD_STATUSES, overload_errors=OVERLOAD_ERRORS):
+        self.name = name
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.on_change = on_change
+        self.overload_statuses = frozenset(overload_statuses)
+        self.overload_errors = tuple(overload_errors)
+        self.reason = "başlangıç"
+        self.history = deque(maxlen=50)   # (zaman, eski limit, yeni limit, neden)
+        self._limit = min(self.maximum, max(self.minimum, int(initial)))
+        self._latencies = []
+        self._errors = 0
+        self._saturated = False
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self):
+        return self._limit
+
+    def note_in_flight(self, in_flight):
+        """Limit doluyken artırma kararı verilebilir (kullanılmayan limit büyütülmez)"""
+        if in_flight >= self._limit:
+            self._saturated = True
+
+    def record(self, latency, status=None, error=None):
+        """Bir isteğin sonucunu kaydet; gerekirse limiti değiştir"""
+        if error is not None and not isinstance(error, self.overload_errors):
+            return
+        change = None
+        with self._lock:
+            bad = overloaded(status, error, self.overload_statuses, self.overload_errors)
+            self._latencies.append(latency)
+            self._errors += bad
+            now = time.monotonic()
+            if status == 429 and now - self._last_decrease >= self.cooldown:
+                change = self._decrease(now, "429 (istek sınırı) yanıtı")
+            elif len(self._latencies) >= self.window:
+                change = self._evaluate(now)
+        if change:
+            self._changed(*change)
+
+    def _evaluate(self, now):
+        samples = len(self._latencies)
+        p95 = percentile(self._latencies, 0.95)
+        error_rate = self._errors / samples
+        saturated = self._saturated
+        self._reset()
+        if error_rate > self.max_error_rate:
+            if now - self._last_decrease >= self.cooldown:
+                return self._decrease(now, f"hata oranı %{error_rate * 100:.0f}")
+            return None
+        if p95 > self.target_p95:
+            if now - self._last_decrease >= self.cooldown:
+                return self._decrease(now, f"p95 gecikme {p95:.1f}s > {self.target_p95:.1f}s")
+            return None
+        if saturated and self._limit < self.maximum:
+            return self._set(min(self.maximum, self._limit + self.increase),
+                             f"sağlıklı (p95 {p95:.1f}s, hata %{error_rate * 100:.0f})")
+        return None
+
+    def _decrease(self, now, reason):
+        self._last_decrease = now
+        self._reset()
+        return self._set(max(self.minimum, int(self._limit * self.decrease)), reason)
+
+    def _reset(self):
+        self._latencies = []
+        self._errors = 0
+        self._saturated = False
+
+    def _set(self, limit, reason):
+        if limit == self._limit:
+            return None
+        old, self._limit = self._limit, limit
+        self.reason = reason
+        self.history.append((time.time(), old, limit, reason))
+        return old, limit, reason
+
+    def _changed(self, old, new, reason):
+        logger.info(f"{self.name} eşzamanlılık limiti {old} -> {new}: {reason}")
+        if self.on_change:
+            self.on_change(self, old, new, reason)
+
+    def status(self):
+        return f"{self.name}: {self._limit} ({self.reason})"
+
+
+class AdaptiveGate:
+    """
+    Limiti bir AimdController'dan okunan asyncio kapısı (değişken boyutlu semafor).
+
+    `async with gate:` ile kullanılır. Limit başka bir iş parçacığında değiştiğinde `limit_changed`
+    bekleyenleri olay döngüsünde uyandırır.
+    """
+
+    def __init__(self, controller, loop=None):
+        self.controller = controller
+        self.in_flight = 0
+        self._waiters = deque()
+        self._loop = loop or asyncio.get_running_loop()
+
+    async def __aenter__(self):
+        while self.in_flight >= self.controller.limit:
+            waiter = self._loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+        self.controller.note_in_flight(self.in_flight)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        free = self.controller.limit - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def limit_changed(self):
+        """Limit değiştiğinde (herhangi bir iş parçacığından) çağrılır"""
+        self._loop.call_soon_threadsafe(self._wake)
@@ -0,0 +1,115 @@
+"""
+HTML ayrıştırıcı karşılaştırması.
+
+Kaydedilmiş HTML sayfaları üzerinde her ayrıştırıcı için sayfa ayrıştırma ve bilgi çıkarma
+sürelerini ölçer ve çıkarılan bilgilerin html.parser sonuçlarıyla aynı olup olmadığını kontrol eder.
+
+Kullanım:
+    python benchmark_parsers.py sayfalar/            # .html dosyalarının bulunduğu klasör
+    python benchmark_parsers.py --http-cache http_cache
+    python benchmark_parsers.py --archive debug_archive
+"""
+import os
+import sys
+import time
+import zlib
+import sqlite3
+import argparse
+import logging
+from parser_backend import available_backends, make_soup
+from page_document import PageDocument
+from company_scraper import extract_page_data
+from debug_archive import iter_archive
+
+
+def load_files(paths):
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(root, name)
+                           for root, _, names in os.walk(path)
+                           for name in names if name.lower().endswith(('.html', '.htm')))
+        else:
+            files = [path]
+        for file_path in files:
+            with open(file_path, encoding='utf-8', errors='replace') as f:
+                pages.append((file_path, f.read()))
+    return pages
+
+
+def load_http_cache(cache_dir):
+    """HTTP önbelleğindeki HTML yanıtlarını yükle"""
+    conn = sqlite3.connect(os.path.join(cache_dir, "responses.sqlite"))
+    pages = []
+    for url, body, encoding in conn.execute("SELECT url, body, encoding FROM responses"):
+        pages.append((url, zlib.decompress(body).decode(encoding or 'utf-8', errors='replace')))
+    conn.close()
+    return pages
+
+
+def load_archive(directory):
+    return [(record.get('query') or record.get('url') or record['kind'], content.decode('utf-8', errors='replace'))
+            for record, content in iter_archive(directory)]
+
+
+def run_backend(backend, pages, repeat):
+    """Tüm sayfaları verilen ayrıştırıcıyla işle; süreleri ve çıkarılan verileri döndür"""
+    soup_time = document_time = extract_time = 0.0
+    results = []
+    for _ in range(repeat):
+        results = []
+        for name, html in pages:
+            start = time.perf_counter()
+            make_soup(html, backend)
+            soup_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            doc = PageDocument.from_html(html, name, backend=backend)
+            document_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            results.append(extract_page_data(doc, name))
+            extract_time += time.perf_counter() - start
+    return soup_time / repeat, document_time / repeat, extract_time / repeat, results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="HTML ayrıştırıcılarını kaydedilmiş sayfalar üzerinde karşılaştır")
+    arg_parser.add_argument('paths', nargs='*', help=".html dosyaları veya klasörleri")
+    arg_parser.add_argument('--http-cache', help="HTTP önbellek klasörü (responses.sqlite)")
+    arg_parser.add_argument('--archive', help="Hata ayıklama arşivi klasörü")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Her ayrıştırıcı için tekrar sayısı")
+    args = arg_parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    pages = load_files(args.paths)
+    if args.http_cache:
+        pages += load_http_cache(args.http_cache)
+    if args.archive:
+        pages += load_archive(args.archive)
+    if not pages:
+        arg_parser.error("Sayfa bulunamadı")
+
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"{len(pages)} sayfa, {total_bytes / 1024 / 1024:.1f} MB, {args.repeat} tekrar\n")
+    print(f"{'ayrıştırıcı':<12} {'soup (s)':>9} {'belge (s)':>10} {'çıkarma (s)':>12} {'sayfa/s':>9} {'hızlanma':>9} {'farklı':>7}")
+
+    baseline_results = baseline_total = None
+    backends = sorted(available_backends(), key=lambda name: name != 'html.parser')
+    for backend in backends:
+        soup_time, document_time, extract_time, results = run_backend(backend, pages, args.repeat)
+        total = document_time + extract_time
+        if baseline_results is None:
+            baseline_results, baseline_total = results, total
+        mismatches = [name for (name, _), a, b in zip(pages, baseline_results, results) if a != b]
+        print(f"{backend:<12} {soup_time:>9.3f} {document_time:>10.3f} {extract_time:>12.3f} "
+              f"{len(pages) / total:>9.1f} {baseline_total / total:>8.2f}x {len(mismatches):>7}")
+        for name in mismatches[:5]:
+            print(f"    farklı sonuç: {name}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,22 @@
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from parser_backend import make_soup
 import re
-import time
 import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
+from requests import compat as requests_compat
+from http_client import http_get, cache_response
+from search_cache import get_search_cache
+from debug_archive import capture_debug
+from dns_probe import find_domain_by_dns, DEFAULT_PROBE_TIMEOUT
+from deadline import current_deadline, run_with_deadline, clamp_timeout
+from page_document import PageDocument, as_document
+from structured_data import extract_structured_data
+from contact_scanner import (
+    DEFAULT_EMAIL_PATTERN, DEFAULT_PHONE_PATTERNS, compile_scanner, get_scanner
+)
 
 # Set up logging
 logging.basicConfig(
@@ -68,13 +79,13 @@ def extract_website_from_social_media(url):
     
     try:
         headers = get_random_headers()
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_get(url, headers=headers, timeout=15)
         
         if response.status_code != 200:
             logging.warning(f"Sosyal medya URL'sine erişilemedi, durum kodu: {response.status_code}")
             return None
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text)
         
         # Facebook sayfasından web sitesi URL'si çıkarma
         if 'facebook.com' in url:
@@ -175,13 +186,40 @@ def extract_website_from_social_media(url):
         logging.error(f"Sosyal medya profilinden web sitesi çıkarma hatası: {e}")
         return None
 
-def find_website_via_google(company_name, result_index=0, max_results=10):
+def find_website_via_google(company_name, result_index=0, max_results=10, use_cache=True):
     """Search for company website using Bing search
     
+    Results are kept in the search cache, so the same company name is only
+    sent to the search engine once until the cache entry expires.
+    
     Args:
         company_name: The company name to search for
         result_index: Which search result to use (0 = first result)
         max_results: Maximum number of results to fetch
+        use_cache: Use the persistent search cache
+    """
+    cache = get_search_cache() if use_cache else None
+    if cache is not None:
+        entry = cache.get(company_name, result_index)
+        if entry is not None:
+            logging.info(f"Using cached search result for {company_name}: {entry.website}")
+            return entry.website
+    
+    website, candidates = _search_website(company_name, result_index, max_results)
+    
+    # candidates is None when the search itself failed; don't remember failures
+    if cache is not None and candidates is not None:
+        try:
+            cache.put(company_name, result_index, website, candidates)
+        except Exception as e:
+            logging.warning(f"Could not store search result for {company_name}: {e}")
+    return website
+
+def _search_website(company_name, result_index=0, max_results=10):
+    """Run the Bing search and pick a website
+    
+    Returns:
+        (website, candidates) tuple; candidates is None if the search failed
     """
     try:
         query = f"{company_name} resmi sitesi"
@@ -199,18 +237,17 @@ def find_website_via_google(company_name, result_index=0, max_results=10):
             'Upgrade-Insecure-Requests': '1',
         }
         
-        response = requests.get(search_url, headers=headers, timeout=15)
+        response = http_get(search_url, headers=headers, timeout=15)
         
-        # Save the search result HTML for debugging
-        with open(f"{company_name.replace(' ', '_')}_search_response.html", "w", encoding="utf-8") as f:
-            f.write(response.text)
+        # Keep the search result HTML when debug capture is enabled
+        capture_debug('serp', response.text, query=company_name, url=search_url, status=response.status_code)
         
         if response.status_code != 200:
             logging.warning(f"Search failed, status code: {response.status_code}")
-            return None
+            return None, None
             
         # Parse results
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = make_soup(response.text)
         
         # Find search results - Bing structure
         search_results = []
@@ -254,7 +291,7 @@ def find_website_via_google(company_name, result_index=0, max_results=10):
                 website_from_social = extract_website_from_social_media(social_url)
                 if website_from_social:
                     logging.info(f"Sosyal medyadan web sitesi bulundu: {website_from_social}")
-                    return website_from_social
+                    return website_from_social, search_results + social_media_results
         
         # If still no results, try a more general approach
         if not search_results:
@@ -284,29 +321,18 @@ def find_website_via_google(company_name, result_index=0, max_results=10):
                     website_from_social = extract_website_from_social_media(href)
                     if website_from_social:
                         logging.info(f"Son çare sosyal medyadan web sitesi bulundu: {website_from_social}")
-                        return website_from_social
+                        return website_from_social, search_results + social_media_results
                 
         if not search_results:
-            # Last resort: try direct DNS lookup
-            potential_domains = [
-                f"{company_name.lower().replace(' ', '')}.com",
-                f"{company_name.lower().replace(' ', '')}.com.tr",
-                f"www.{company_name.lower().replace(' ', '')}.com",
-                f"www.{company_name.lower().replace(' ', '')}.com.tr"
-            ]
-            
-            for domain in potential_domains:
-                try:
-                    import socket
-                    socket.gethostbyname(domain)
-                    url = f"http://{domain}"
-                    logging.info(f"Found domain via DNS lookup: {url}")
-                    return url
-                except:
-                    continue
+            # Last resort: probe guessed domains concurrently via DNS
+            domain = find_domain_by_dns(company_name, timeout=clamp_timeout(DEFAULT_PROBE_TIMEOUT, "DNS"))
+            if domain:
+                url = f"http://{domain}"
+                logging.info(f"Found domain via DNS lookup: {url}")
+                return url, search_results + social_media_results
             
             logging.warning(f"No search results found for {company_name}")
-            return None
+            return None, social_media_results
         
         # Log all results for debugging
         for i, result in enumerate(search_results[:max_results]):
@@ -327,100 +353,87 @@ def find_website_via_google(company_name, result_index=0, max_results=10):
             # If requested index is within matches, return that
             if result_index < len(match_results):
                 logging.info(f"Using match #{result_index+1} for {company_name}: {match_results[result_index]}")
-                return match_results[result_index]
+                return match_results[result_index], search_results + social_media_results
             # Otherwise use first match
             logging.info(f"Using first match for {company_name}: {match_results[0]}")
-            return match_results[0]
+            return match_results[0], search_results + social_media_results
                 
         # If no matches and requested index is valid
         if result_index < len(search_results):
             logging.info(f"Using result #{result_index+1} for {company_name}: {search_results[result_index]}")
-            return search_results[result_index]
+            return search_results[result_index], search_results + social_media_results
         
         # Fallback to first result
         if search_results:
             logging.info(f"Using first result for {company_name}: {search_results[0]}")
-            return search_results[0]
+            return search_results[0], search_results + social_media_results
         
-        return None
+        return None, search_results + social_media_results
         
     except Exception as e:
         logging.error(f"Error searching for {company_name}: {e}")
-        return None
+        return None, None
 
-def extract_emails(text, email_pattern=r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'):
+def extract_emails(text, email_pattern=DEFAULT_EMAIL_PATTERN):
     """Extract email addresses from text"""
-    if not text:
-        return []
-        
-    emails = re.findall(email_pattern, text)
-    return list(set(emails))  # Remove duplicates
+    # scrape_company_website passes None when no custom pattern is given
+    emails, _ = compile_scanner(email_pattern or DEFAULT_EMAIL_PATTERN, ()).scan(text)
+    return emails
+
+def _instagram_handle(href):
+    """Return '@username' for an Instagram profile URL, None otherwise"""
+    if 'instagram.com' not in href:
+        return None
+    # Extract username from URL
+    username_match = re.search(r'instagram\.com/([^/?]+)', href)
+    if username_match:
+        username = username_match.group(1)
+        if username not in ['p', 'explore', 'reels']:  # Filter out non-profile pages
+            return '@' + username if not username.startswith('@') else username
+    return None
+
+def _linkedin_profile(href):
+    """Return the URL if it points to a LinkedIn company or personal profile"""
+    if 'linkedin.com' in href and ('/company/' in href or '/in/' in href):
+        return href
+    return None
 
-def extract_instagram(soup, website_url):
+def extract_instagram(page, website_url):
     """Extract Instagram handle"""
-    # Look for links to Instagram
-    instagram_links = soup.select('a[href*="instagram.com"]')
+    doc = as_document(page)
     
-    for link in instagram_links:
-        href = link.get('href', '')
-        # Extract username from URL
-        username_match = re.search(r'instagram\.com/([^/?]+)', href)
-        if username_match:
-            username = username_match.group(1)
-            if username not in ['p', 'explore', 'reels']:  # Filter out non-profile pages
-                return '@' + username if not username.startswith('@') else username
+    # Look for links to Instagram
+    for href, _ in doc.links:
+        handle = _instagram_handle(href)
+        if handle:
+            return handle
     
     return None
 
-def extract_linkedin(soup, website_url):
+def extract_linkedin(page, website_url):
     """Extract LinkedIn profile"""
-    linkedin_links = soup.select('a[href*="linkedin.com"]')
+    doc = as_document(page)
     
-    for link in linkedin_links:
-        href = link.get('href', '')
-        if '/company/' in href or '/in/' in href:
-            return href
+    for href, _ in doc.links:
+        profile = _linkedin_profile(href)
+        if profile:
+            return profile
     
     return None
 
 def extract_phone_numbers(text, phone_patterns=None):
     """Extract phone numbers with various formats"""
-    if not text:
-        return []
-        
     # Default patterns if none specified
-    if not phone_patterns:
-        phone_patterns = [
-            r'(?:\+90|0)?\s*\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{2}[-.\s]?\d{2}',
-            r'(?:\+90|0)?\s*\d{3}\s*\d{3}\s*\d{2}\s*\d{2}',
-            r'(?:\+90|0)?\s*\d{3}\s*\d{3}\s*\d{4}'
-        ]
-    
-    results = []
-    for pattern in phone_patterns:
-        matches = re.findall(pattern, text)
-        results.extend(matches)
-    
-    # Clean up and standardize
-    cleaned = []
-    for phone in results:
-        # Remove non-digit characters
-        digits = re.sub(r'\D', '', phone)
-        # Format consistently (assuming Turkish numbers)
-        if len(digits) >= 10:
-            if digits.startswith('90') and len(digits) >= 12:
-                digits = digits[2:]  # Remove country code
-            elif digits.startswith('0'):
-                digits = digits[1:]  # Remove leading 0
-            
-            if len(digits) == 10:  # Standard 10-digit Turkish number
-                formatted = f"+90 {digits[0:3]} {digits[3:6]} {digits[6:8]} {digits[8:10]}"
-                cleaned.append(formatted)
-    
-    return list(set(cleaned))  # Remove duplicates
+    _, phones = compile_scanner(None, tuple(phone_patterns or DEFAULT_PHONE_PATTERNS)).scan(text)
+    return phones
 
-def extract_address(soup):
+# Text nodes that label an address ("Adres:", "Address" ...)
+_ADDRESS_LABEL_RE = re.compile(r'adres|adress|address', re.I)
+
+def extract_address(page):
     """Extract company address with improved accuracy"""
+    doc = as_document(page)
+    
     # Common elements containing address information
     address_selectors = [
         'address', '.address', '.contact-address', '.footer-address',
@@ -432,33 +445,32 @@ def extract_address(soup):
     
     for selector in address_selectors:
         try:
-            elements = soup.select(selector)
+            elements = doc.select(selector)
             for element in elements:
                 # Look for text containing address indicators in Turkish
                 address_text = ""
                 
                 # If we find an explicit address label, use the text that follows it
-                address_labels = element.find_all(text=re.compile(r'adres|adress|address', re.I))
-                for label in address_labels:
+                for string_index in doc.strings_matching_in(element, _ADDRESS_LABEL_RE):
                     # Get the parent element
-                    parent = label.parent
+                    parent = doc.string_parent(string_index)
                     if parent:
                         # Get all text after the label
-                        siblings = list(parent.find_next_siblings())
+                        siblings = doc.next_siblings(parent)
                         if siblings:
                             for sibling in siblings:
-                                sibling_text = sibling.get_text(strip=True)
+                                sibling_text = doc.element_text(sibling)
                                 if sibling_text and len(sibling_text) > 10:
                                     return sibling_text
                         else:
                             # If no siblings, maybe the address is in the same element
-                            full_text = parent.get_text(strip=True)
+                            full_text = doc.element_text(parent)
                             address_part = re.sub(r'.*adres[^:]*:', '', full_text, flags=re.I)
                             if address_part != full_text:  # If we found and removed "Adres:" or similar
                                 return address_part.strip()
                 
                 # If no explicit label found, look for text that looks like an address
-                text = element.get_text(strip=True)
+                text = doc.element_text(element)
                 
                 # Look for common Turkish address patterns (post code, city names)
                 if re.search(r'\b\d{5}\b', text) or re.search(r'\b(İstanbul|Ankara|İzmir|Antalya|Bursa)\b', text, re.I):
@@ -481,33 +493,40 @@ def extract_address(soup):
             logging.debug(f"Error extracting address with selector {selector}: {e}")
             continue
     
-    # Look for structured data
-    script_tags = soup.find_all('script', {'type': 'application/ld+json'})
-    for script in script_tags:
-        try:
-            if 'address' in script.text.lower() or 'postaladdress' in script.text.lower():
-                # Try to parse JSON
-                import json
-                json_data = json.loads(script.text)
-                
-                # Look for address in the JSON structure
-                if isinstance(json_data, dict):
-                    if 'address' in json_data:
-                        address_obj = json_data['address']
-                        if isinstance(address_obj, dict):
-                            address_parts = []
-                            for key in ['streetAddress', 'addressLocality', 'addressRegion', 'postalCode']:
-                                if key in address_obj and address_obj[key]:
-                                    address_parts.append(address_obj[key])
-                            return ' '.join(address_parts)
-        except Exception as e:
-            logging.debug(f"Error parsing JSON-LD address data: {e}")
-            continue
+    # Look for structured data (JSON-LD blocks are parsed once while building the document)
+    for json_data in doc.json_ld:
+        # Look for address in the JSON structure
+        if isinstance(json_data, dict) and 'address' in json_data:
+            address_obj = json_data['address']
+            if isinstance(address_obj, dict):
+                address_parts = []
+                for key in ['streetAddress', 'addressLocality', 'addressRegion', 'postalCode']:
+                    if key in address_obj and address_obj[key]:
+                        address_parts.append(str(address_obj[key]))
+                return ' '.join(address_parts)
     
     return None
 
-def extract_about(soup):
+# Navigation, menu and footer blocks that are left out of about text
+_ABOUT_EXCLUDED_TAGS = {'nav', 'header', 'footer', 'form', 'iframe'}
+_ABOUT_EXCLUDED_CLASSES = {'menu', 'navbar', 'navigation', 'footer', 'header', 'sidebar', 'social-links',
+                           'contact-info', 'copyright'}
+
+def _is_about_noise(doc, element):
+    """True for descendants that the about text should skip (menus, nav links, footers...)"""
+    if element.tag in _ABOUT_EXCLUDED_TAGS or _ABOUT_EXCLUDED_CLASSES.intersection(element.classes):
+        return True
+    class_attr = ' '.join(element.classes)
+    element_id = element.id or ''
+    if any(word in class_attr for word in ('menu', 'nav', 'social', 'button')) or \
+            'menu' in element_id or 'nav' in element_id:
+        return True
+    # If link text is short, likely a navigation item
+    return element.tag == 'a' and len(doc.element_text(element)) < 20
+
+def extract_about(page):
     """Extract about/company info with improved cleaning"""
+    doc = as_document(page)
     about_selectors = [
         '.about-us', '.about', '.hakkimizda', '#about', '#hakkimizda', '.kurumsal',
         'section:contains("Hakkımızda")', 'div:contains("Hakkımızda")',
@@ -518,24 +537,11 @@ def extract_about(soup):
     # First try to find dedicated about sections
     for selector in about_selectors:
         try:
-            elements = soup.select(selector)
+            elements = doc.select(selector)
             for element in elements:
-                # Deep clean the element by removing all navigation, menu, and footer elements
-                for nav_element in element.select('nav, .menu, .navbar, .navigation, header, footer, .footer, .header, .sidebar, ul.menu, .social-links, .contact-info, .copyright, form, iframe'):
-                    nav_element.decompose()
-                
-                # Remove any elements with common unwanted class names
-                for unwanted in element.select('[class*="menu"], [class*="nav"], [class*="social"], [id*="menu"], [id*="nav"], [class*="button"]'):
-                    unwanted.decompose()
-                    
-                # Remove elements that are likely navigation links
-                for link in element.find_all('a'):
-                    # If link text is short, likely a navigation item
-                    if len(link.get_text(strip=True)) < 20:
-                        link.decompose()
-                
-                # Get cleaned text
-                text = element.get_text(strip=True)
+                # Text without navigation, menu, footer and short link elements
+                # (the document is shared with the other extractors, so nothing is removed from it)
+                text = doc.element_text_excluding(element, lambda child: _is_about_noise(doc, child))
                 if len(text) > 50:  # Likely an about section if it's substantial
                     # Clean up the text
                     text = re.sub(r'\s+', ' ', text)  # Remove extra whitespace
@@ -550,7 +556,7 @@ def extract_about(soup):
                     # Look for paragraphs with company name mentions or "hakkında" etc.
                     if len(text) > 800:
                         sentences = text.split('. ')
-                        company_name_pattern = soup.title.string.split('-')[0].strip() if soup.title else ""
+                        company_name_pattern = doc.title.split('-')[0].strip()
                         relevant_sentences = []
                         
                         for sentence in sentences:
@@ -574,113 +580,305 @@ def extract_about(soup):
             continue
     
     # If specific selectors fail, look for meta description as fallback
-    meta_desc = soup.find('meta', {'name': 'description'})
-    if meta_desc and 'content' in meta_desc.attrs:
-        content = meta_desc['content']
-        if len(content) > 10:  # Only if it's substantial
-            return content
+    content = doc.meta.get('description')
+    if content and len(content) > 10:  # Only if it's substantial
+        return content
     
     # Try to find paragraph with company name
+    company_name_pattern = doc.title.split('-')[0].strip()
+    if company_name_pattern and len(company_name_pattern) > 3:
+        # Only paragraphs that the text index says mention the name
+        mentions = doc.elements_containing(company_name_pattern)
+        for p in doc.find_all('p'):
+            if p.index not in mentions:
+                continue
+            p_text = doc.element_text(p)
+            if company_name_pattern in p_text and len(p_text) > 100:
+                return p_text
+    
+    return None
+
+# Maximum number of contact page candidates fetched in parallel per site
+MAX_CONTACT_CANDIDATES = 4
+
+# Shared pool for contact page requests (each company only uses a few slots at a time)
+DEFAULT_CONTACT_WORKERS = 32
+_contact_executor = ThreadPoolExecutor(max_workers=DEFAULT_CONTACT_WORKERS, thread_name_prefix='contact')
+_contact_workers = DEFAULT_CONTACT_WORKERS
+_contact_lock = threading.Lock()
+
+def configure_contact_pool(max_concurrency):
+    """
+    Size the contact page pool for the given number of concurrent companies.
+    
+    Every company may fetch up to MAX_CONTACT_CANDIDATES candidates at once; a smaller
+    pool would make candidates queue while their company's time budget runs.
+    The pool only grows; requests already submitted finish on the old pool.
+    """
+    global _contact_executor, _contact_workers
+    workers = max(DEFAULT_CONTACT_WORKERS, int(max_concurrency) * MAX_CONTACT_CANDIDATES)
+    with _contact_lock:
+        if workers <= _contact_workers:
+            return
+        old_executor = _contact_executor
+        _contact_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='contact')
+        _contact_workers = workers
+    old_executor.shutdown(wait=False)
+
+def find_contact_urls(page, url):
+    """Collect unique contact page URLs linked from the homepage"""
+    doc = as_document(page)
+    page_url = url.rstrip('/')
+    contact_urls = []
+    
+    for href, _ in doc.links:
+        if not any(keyword in href for keyword in ('contact', 'iletisim', 'iletişim')):
+            continue
+        if href.startswith(('http://', 'https://')):
+            contact_url = href
+        else:
+            base_url = url.rstrip('/')
+            href = href.lstrip('/')
+            contact_url = f"{base_url}/{href}"
+        
+        # Drop fragments; links back to the homepage itself add nothing
+        contact_url = contact_url.split('#')[0]
+        if contact_url.rstrip('/') == page_url or contact_url in contact_urls:
+            continue
+        contact_urls.append(contact_url)
+        
+        if len(contact_urls) >= MAX_CONTACT_CANDIDATES:
+            break
+    
+    return contact_urls
+
+def _fetch_contact_candidate(contact_url, cancelled):
+    """Fetch one contact page candidate unless another candidate already won"""
+    if cancelled.is_set():
+        return None
     try:
-        company_name_pattern = soup.title.string.split('-')[0].strip() if soup.title else ""
-        if company_name_pattern and len(company_name_pattern) > 3:
-            for p in soup.find_all('p'):
-                p_text = p.get_text(strip=True)
-                if company_name_pattern in p_text and len(p_text) > 100:
-                    return p_text
+        response = http_get(contact_url, headers=get_random_headers(), timeout=10, stream=True)
+        # Skip downloading the body if another candidate finished first
+        if cancelled.is_set() or response.status_code != 200:
+            response.close()
+            return None
+        response.content  # Read body while still in the worker thread
+        cache_response(contact_url, response)
+        return response
     except Exception as e:
-        logging.debug(f"Error finding paragraph with company name: {e}")
+        logging.error(f"Error accessing contact page {contact_url}: {e}")
+        return None
+
+def fetch_first_contact_page(contact_urls):
+    """
+    Fetch all contact page candidates concurrently.
     
-    return None
+    Returns the first response with status 200 and cancels the remaining
+    candidates, or None if none of them succeeded.
+    """
+    if not contact_urls:
+        return None
+    
+    # The candidates share the company's time budget
+    cancelled = threading.Event()
+    deadline = current_deadline()
+    # Submit under the lock so a resize cannot shut the pool down in between
+    with _contact_lock:
+        futures = [_contact_executor.submit(run_with_deadline, deadline, _fetch_contact_candidate, contact_url, cancelled)
+                   for contact_url in contact_urls]
+    try:
+        for future in as_completed(futures):
+            response = future.result()
+            if response is not None:
+                logging.info(f"Using contact page: {response.url}")
+                return response
+        return None
+    finally:
+        cancelled.set()
+        for future in futures:
+            future.cancel()
+
+def structured_page_data(doc, scanner=None):
+    """
+    Fields filled from JSON-LD / microdata / OpenGraph, in extract_page_data's format.
+    
+    Emails and phones go through the scanner, so the user's email and phone
+    formats filter structured values the same way they filter page text.
+    """
+    structured = extract_structured_data(doc)
+    same_as = structured.get('same_as', [])
+    scanner = scanner or get_scanner()
+    emails, _ = scanner.scan('\n'.join(structured.get('emails', [])))
+    _, phones = scanner.scan('\n'.join(structured.get('phone_texts', [])))
+    data = {
+        'emails': emails,
+        'phones': phones,
+        'instagram': next(filter(None, map(_instagram_handle, same_as)), None),
+        'linkedin': next(filter(None, map(_linkedin_profile, same_as)), None),
+        'address': structured.get('address'),
+        'about': structured.get('description')
+    }
+    return {key: value for key, value in data.items() if value}
+
+# Output columns and the page data keys that fill them
+OUTPUT_FIELDS = {
+    'Mail': 'emails',
+    'Instagram': 'instagram',
+    'Linkedin': 'linkedin',
+    'Telefon': 'phones',
+    'Adres': 'address',
+    'Hakkımızda': 'about'
+}
+
+# Fields a contact page can contribute (about text is only taken from the homepage)
+CONTACT_PAGE_FIELDS = {'emails', 'phones', 'address', 'instagram', 'linkedin'}
+
+def requested_keys(fields=None):
+    """Translate output column names (e.g. 'Mail', 'Adres') into page data keys; None means all"""
+    if fields is None:
+        return set(OUTPUT_FIELDS.values())
+    return {OUTPUT_FIELDS[field] for field in fields if field in OUTPUT_FIELDS}
+
+def extract_page_data(doc, website_url, email_pattern=None, phone_patterns=None, include_about=True, scanner=None,
+                      keys=None):
+    """Run the extractors for the requested keys (all by default) over one parsed page"""
+    keys = set(OUTPUT_FIELDS.values()) if keys is None else set(keys)
+    if not include_about:
+        keys.discard('about')
+    
+    scanner = scanner or get_scanner(email_pattern, phone_patterns)
+    
+    # Structured data first; heuristic extractors only run for the fields it left empty
+    data = {key: value for key, value in structured_page_data(doc, scanner).items() if key in keys}
+    
+    # Emails and phones come from a single pass over the page text
+    if ('emails' in keys and 'emails' not in data) or ('phones' in keys and 'phones' not in data):
+        emails, phones = scanner.scan(doc.scan_text)
+        if 'emails' in keys:
+            data.setdefault('emails', emails)
+        if 'phones' in keys:
+            data.setdefault('phones', phones)
+    if 'instagram' in keys and 'instagram' not in data:
+        data['instagram'] = extract_instagram(doc, website_url)
+    if 'linkedin' in keys and 'linkedin' not in data:
+        data['linkedin'] = extract_linkedin(doc, website_url)
+    if 'address' in keys and 'address' not in data:
+        data['address'] = extract_address(doc)
+    if 'about' in keys and 'about' not in data:
+        data['about'] = extract_about(doc)
+    return data
+
+def merge_company_data(main_data, contact_data=None):
+    """Merge page data, preferring contact page values, and format the output row"""
+    contact_data = contact_data or {}
+    result = {}
+    for key in set(main_data) | set(contact_data):
+        if key in contact_data and contact_data[key]:
+            result[key] = contact_data[key]
+        else:
+            result[key] = main_data.get(key)
+    
+    # Format output
+    return {
+        'Mail': ', '.join(result.get('emails', [])) if result.get('emails') else None,
+        'Instagram': result.get('instagram'),
+        'Linkedin': result.get('linkedin'),
+        'Telefon': ', '.join(result.get('phones', [])) if result.get('phones') else None,
+        'Adres': result.get('address'),
+        'Hakkımızda': result.get('about')
+    }
+
+def fetch_homepage(url):
+    """Download the homepage; returns the response, or None if the status is not 200"""
+    logging.info(f"Scraping website: {url}")
+    
+    # Make request with random user agent
+    response = http_get(url, headers=get_random_headers(), timeout=20)
+    
+    # Check if request was successful
+    if response.status_code != 200:
+        logging.warning(f"Failed to access {url}, status code: {response.status_code}")
+        return None
+    return response
+
+def decode_html(content, encoding=None):
+    """Decode a response body the way requests' Response.text does"""
+    if not encoding:
+        encoding = requests_compat.chardet.detect(content)['encoding']
+    try:
+        return str(content, encoding or 'utf-8', errors='replace')
+    except (LookupError, TypeError):
+        return str(content, errors='replace')
+
+def extract_homepage(html, url, keys, scanner=None):
+    """
+    Extract the requested keys from the homepage.
+    
+    Returns (data, contact_urls); contact_urls is empty unless the contact page
+    is needed for a requested field that is still missing.
+    """
+    # Parse HTML once; every extractor reads the same document
+    doc = PageDocument.from_html(html, url)
+    main_data = extract_page_data(doc, url, scanner=scanner, keys=keys)
+    
+    # Get contact page for better data, unless the homepage already filled every requested field a contact page could fill
+    contact_keys = keys & CONTACT_PAGE_FIELDS
+    if contact_keys and not all(main_data.get(key) for key in contact_keys):
+        return main_data, find_contact_urls(doc, url)
+    if contact_keys:
+        logging.info(f"All requested fields found on homepage, skipping contact page: {url}")
+    return main_data, []
+
+def extract_contact_page(html, page_url, url, keys, scanner=None):
+    """Extract the contact-page fields among the requested keys"""
+    contact_doc = PageDocument.from_html(html, page_url)
+    return extract_page_data(contact_doc, url, scanner=scanner, keys=keys & CONTACT_PAGE_FIELDS)
 
-def scrape_company_website(url, email_pattern=None, phone_patterns=None):
-    """Scrape company information from website"""
+def scrape_company_website(url, email_pattern=None, phone_patterns=None, scanner=None, fields=None, stats=None):
+    """
+    Scrape company information from website.
+    
+    fields limits the work to the given output columns (e.g. {'Mail', 'Telefon'});
+    None scrapes everything. Extractors for other columns are not run, and the
+    contact page is only fetched while a requested field it can fill is still empty.
+    If a stats dict is given, the number of pages downloaded is stored under 'fetches'.
+    """
+    if stats is not None:
+        stats['fetches'] = 0
     if not url:
         return {}
         
     url = clean_url(url)
     if not url:
         return {}
+    
+    keys = requested_keys(fields)
+    if not keys:
+        return {}
         
     try:
-        logging.info(f"Scraping website: {url}")
-        
-        # Make request with random user agent
-        response = requests.get(url, headers=get_random_headers(), timeout=20)
-        
-        # Check if request was successful
-        if response.status_code != 200:
-            logging.warning(f"Failed to access {url}, status code: {response.status_code}")
+        response = fetch_homepage(url)
+        if stats is not None:
+            stats['fetches'] += 1
+        if response is None:
             return {}
             
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Compile the email/phone patterns once (cached per pattern set)
+        scanner = scanner or get_scanner(email_pattern, phone_patterns)
         
-        # Extract all text for email and phone searches
-        all_text = soup.get_text()
-        
-        # Get contact page for better data
-        contact_links = soup.select('a[href*="contact"], a[href*="iletisim"], a[href*="iletişim"], a[href*="contact-us"]')
+        main_data, contact_urls = extract_homepage(response.text, url, keys, scanner=scanner)
         contact_data = {}
-        
-        for link in contact_links:
-            href = link.get('href')
-            if href:
-                if href.startswith(('http://', 'https://')):
-                    contact_url = href
-                else:
-                    base_url = url.rstrip('/')
-                    href = href.lstrip('/')
-                    contact_url = f"{base_url}/{href}"
-                    
-                try:
-                    contact_response = requests.get(contact_url, headers=get_random_headers(), timeout=10)
-                    if contact_response.status_code == 200:
-                        contact_soup = BeautifulSoup(contact_response.text, 'html.parser')
-                        contact_text = contact_soup.get_text()
-                        all_text += " " + contact_text
-                        
-                        # Extract data from contact page
-                        contact_data = {
-                            'emails': extract_emails(contact_text, email_pattern),
-                            'instagram': extract_instagram(contact_soup, url),
-                            'linkedin': extract_linkedin(contact_soup, url),
-                            'phones': extract_phone_numbers(contact_text, phone_patterns),
-                            'address': extract_address(contact_soup)
-                        }
-                        break  # Use the first successful contact page
-                except Exception as e:
-                    logging.error(f"Error accessing contact page {contact_url}: {e}")
-        
-        # Get data from main page if contact page didn't provide it
-        main_data = {
-            'emails': extract_emails(all_text, email_pattern),
-            'instagram': extract_instagram(soup, url),
-            'linkedin': extract_linkedin(soup, url),
-            'phones': extract_phone_numbers(all_text, phone_patterns),
-            'address': extract_address(soup),
-            'about': extract_about(soup)
-        }
-        
-        # Merge data, preferring contact page data where available
-        result = {}
-        for key in main_data:
-            if key in contact_data and contact_data[key]:
-                result[key] = contact_data[key]
-            else:
-                result[key] = main_data[key]
-        
-        # Format output
-        final_data = {
-            'Mail': ', '.join(result.get('emails', [])) if result.get('emails') else None,
-            'Instagram': result.get('instagram'),
-            'Linkedin': result.get('linkedin'),
-            'Telefon': ', '.join(result.get('phones', [])) if result.get('phones') else None,
-            'Adres': result.get('address'),
-            'Hakkımızda': result.get('about')
-        }
-        
-        return final_data
+        if contact_urls:
+            contact_response = fetch_first_contact_page(contact_urls)
+            if contact_response is not None:
+                if stats is not None:
+                    stats['fetches'] += 1
+                contact_data = extract_contact_page(contact_response.text, contact_response.url, url, keys, scanner=scanner)
+        
+        # Contact page values win where both pages have one. Emails and phones
+        # from the homepage are only used when the contact page had none, so
+        # scanning each page's text separately matches scanning them together.
+        return merge_company_data(main_data, contact_data)
         
     except Exception as e:
         logging.error(f"Error scraping {url}: {e}")
@@ -703,41 +901,63 @@ def main():
             if col not in df.columns:
                 df[col] = None
         
-        # Process each company
+        # Results are appended to a journal; the workbook is built from it at the end.
+        # Rows completed by an earlier (interrupted) run are skipped.
+        from crawl_engine import CrawlEngine, CompanyJob
+        from result_journal import (ResultJournal, journal_path_for, export_workbook, completed_keys, row_key,
+                                    run_settings)
+        output_file = 'firmalar_updated.xlsx'
+        # Only rows finished with the same settings (all fields, default patterns, search on) count as done
+        settings = run_settings(OUTPUT_FIELDS, DEFAULT_EMAIL_PATTERN, DEFAULT_PHONE_PATTERNS, True)
+        done_keys = completed_keys(journal_path_for(output_file), settings)
+        
+        # Build the job list (skip empty company names)
+        jobs = []
         for idx, row in df.iterrows():
             company_name = row['FirmaAdı']
             website = row['WebSitesi']
             
-            logging.info(f"Processing company: {company_name}")
-            
             # Skip empty company names
-            if pd.isna(company_name) or not company_name.strip():
+            if pd.isna(company_name) or not str(company_name).strip():
                 continue
-                
-            # If website is missing, search Google
-            if pd.isna(website) or not website.strip():
-                website = find_website_via_google(company_name)
-                df.at[idx, 'WebSitesi'] = website
-                time.sleep(2)  # Pause to avoid hitting Google's rate limits
             
-            # Scrape website for information
-            if website:
-                company_data = scrape_company_website(website)
-                
-                # Update DataFrame with scraped data
-                for col, value in company_data.items():
-                    if value:  # Only update if we found data
-                        df.at[idx, col] = value
-                        
-                # Save progress periodically
-                if idx % 5 == 0:
-                    df.to_excel('firmalar_updated.xlsx', index=False)
-                    
-                # Random delay between requests to avoid being blocked
-                time.sleep(random.uniform(1.5, 3.5))
+            if pd.isna(website) or not str(website).strip():
+                website = None
+            if row_key(idx, company_name, website) not in done_keys:
+                jobs.append(CompanyJob(idx, company_name, website))
+        
+        if done_keys:
+            logging.info(f"Resuming: {len(jobs)} rows left to process")
+        journal = ResultJournal(journal_path_for(output_file), resume=True)
+        
+        def on_result(result):
+            logging.info(f"Processed company: {result.job.company_name}")
+            values = {}
+            
+            # Store the website found via search
+            if result.searched:
+                values['WebSitesi'] = result.website
+            
+            # Only store columns where we found data
+            for col, value in result.data.items():
+                if value:
+                    values[col] = value
+            
+            journal.append(result.job.index, values, company=result.job.company_name,
+                           website=result.job.website, error=result.error, settings=settings)
+        
+        # Process companies concurrently
+        engine = CrawlEngine(search_delay=2, site_delay=2.5)
+        try:
+            engine.run(jobs, on_result=on_result)
+            if engine.deduplicated_scrapes:
+                logging.info(f"Domain deduplication: {engine.deduplicated_scrapes} rows reused a shared website "
+                             f"scrape, {engine.saved_fetches} page fetches saved")
+        finally:
+            journal.close()
         
         # Save final results
-        df.to_excel('firmalar_updated.xlsx', index=False)
+        export_workbook(df, journal.path, output_file, 'FirmaAdı')
         logging.info("Scraping completed successfully!")
         print("İşlem tamamlandı! Sonuçlar 'firmalar_updated.xlsx' dosyasına kaydedildi.")
         
@@ -0,0 +1,139 @@
+import re
+import logging
+from functools import lru_cache
+
+DEFAULT_EMAIL_PATTERN = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+DEFAULT_PHONE_PATTERNS = (
+    r'(?:\+90|0)?\s*\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{2}[-.\s]?\d{2}',
+    r'(?:\+90|0)?\s*\d{3}\s*\d{3}\s*\d{2}\s*\d{2}',
+    r'(?:\+90|0)?\s*\d{3}\s*\d{3}\s*\d{4}'
+)
+
+# Birleştirilmiş ifadede e-posta desenindeki geri başvurular (\1, (?P=ad)) farklı gruplara işaret eder
+_BACKREFERENCE_RE = re.compile(r'\\[1-9]|\(\?P=')
+
+# Telefon adayı: rakamla (veya '+', '(' ile) başlayıp rakamla biten, yalnızca rakam ve ayraç içeren dizi.
+# Yalnızca bu karakterlerle eşleşebilen telefon desenleri bu kısa diziler üzerinde çalıştırılır.
+_PHONE_CANDIDATE = r'[+(]?\d[\d\s().+/-]*\d'
+_MIN_PHONE_DIGITS = 10
+
+# Yalnızca rakam, boşluk ve ayraçlarla eşleşebilen telefon desenleri (adaylar üzerinde çalıştırılabilir).
+# "Tel:" gibi metin içeren veya '.' / \w gibi geniş ifadeler kullanan desenler tüm metinde aranır.
+_CANDIDATE_SAFE_RE = re.compile(r"""(?:
+    \\[ds()+./\-\ ]                                 # \d, \s ve kaçışlı ayraçlar
+  | \[(?:\\[ds()+./\-\ ]|[0-9()+./\-\ ])+\]          # yalnızca rakam / ayraç içeren karakter sınıfı
+  | \(\?: | [()|]                                   # gruplar ve seçenekler
+  | \{\d+(?:,\d*)?\}\?? | [?*+]\??                    # niceleyiciler
+  | [0-9/\-\ ]                                       # düz rakam ve ayraçlar
+)*""", re.X)
+
+logger = logging.getLogger("ContactScanner")
+
+
+def normalize_phone(raw):
+    """Telefon numarasını '+90 XXX XXX XX XX' biçimine çevir (10 haneli değilse None)"""
+    digits = ''.join(ch for ch in raw if ch.isdecimal())
+    if len(digits) < 10:
+        return None
+    if digits.startswith('90') and len(digits) >= 12:
+        digits = digits[2:]  # Ülke kodunu at
+    elif digits.startswith('0'):
+        digits = digits[1:]  # Baştaki 0'ı at
+    if len(digits) != 10:
+        return None
+    return f"+90 {digits[0:3]} {digits[3:6]} {digits[6:8]} {digits[8:10]}"
+
+
+def candidate_safe(pattern):
+    """Desen yalnızca telefon adayı karakterleriyle (rakam, boşluk, ayraç) mı eşleşebilir"""
+    return _CANDIDATE_SAFE_RE.fullmatch(pattern) is not None
+
+
+def _compile(pattern, kind):
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        logger.warning(f"Geçersiz {kind} deseni atlandı: {pattern} ({e})")
+        return None
+
+
+class ContactScanner:
+    """
+    E-posta ve telefon desenlerini bir kez derleyip metni tek geçişte tarar.
+
+    Metin, e-posta deseni ile telefon adaylarını (rakam ve ayraçlardan oluşan diziler) birlikte
+    arayan tek bir ifadeyle taranır. Telefon desenleri yalnızca en az 10 rakam içeren adaylar
+    üzerinde çalıştırılır; böylece uzun sayfa metni her desen için ayrı ayrı taranmaz.
+    Adayların dışındaki karakterlerle de eşleşebilen desenler ("Tel:\s*\d{3}..." gibi) tüm metinde
+    ayrıca aranır. Geçersiz desenler atlanır.
+    """
+
+    def __init__(self, email_pattern=DEFAULT_EMAIL_PATTERN, phone_patterns=DEFAULT_PHONE_PATTERNS):
+        if email_pattern and not _compile(email_pattern, "e-posta"):
+            email_pattern = None
+        phone_patterns = [pattern for pattern in (phone_patterns or ()) if pattern and _compile(pattern, "telefon")]
+
+        # Adaylar kısa olduğundan her telefon deseni ayrı çalıştırılır (örtüşen eşleşmeler kaybolmaz)
+        self._phone_res = [re.compile(pattern) for pattern in phone_patterns if candidate_safe(pattern)]
+        self._text_phone_res = [re.compile(pattern) for pattern in phone_patterns if not candidate_safe(pattern)]
+
+        # Tüm metin üzerinde tek geçişte çalışan ifade
+        parts = []
+        if email_pattern and not _BACKREFERENCE_RE.search(email_pattern):
+            parts.append(f'(?P<email>{email_pattern})')
+            self._email_re = None
+        else:
+            self._email_re = re.compile(email_pattern) if email_pattern else None
+        if self._phone_res:
+            parts.append(f'(?P<phone>{_PHONE_CANDIDATE})')
+        self._scan_re = None
+        if parts:
+            try:
+                self._scan_re = re.compile('|'.join(parts))
+            except re.error:
+                # Satır içi bayraklar gibi birleştirilemeyen e-posta desenleri ayrı taranır
+                self._email_re = re.compile(email_pattern)
+                self._scan_re = re.compile(f'(?P<phone>{_PHONE_CANDIDATE})') if self._phone_res else None
+
+    def _add_phones(self, candidate, phones):
+        if sum(ch.isdecimal() for ch in candidate) < _MIN_PHONE_DIGITS:
+            return
+        for phone_re in self._phone_res:
+            for match in phone_re.finditer(candidate):
+                phone = normalize_phone(match.group(0))
+                if phone:
+                    phones[phone] = None
+
+    def scan(self, text):
+        """Metindeki e-posta adreslerini ve biçimlendirilmiş telefon numaralarını (tekrarsız) döndür"""
+        emails = {}
+        phones = {}
+        if not text:
+            return [], []
+        if self._scan_re is not None:
+            for match in self._scan_re.finditer(text):
+                if match.lastgroup == 'email':
+                    emails[match.group('email')] = None
+                else:
+                    self._add_phones(match.group('phone'), phones)
+        if self._email_re is not None:
+            for match in self._email_re.finditer(text):
+                emails[match.group(0)] = None
+        for phone_re in self._text_phone_res:
+            for match in phone_re.finditer(text):
+                phone = normalize_phone(match.group(0))
+                if phone:
+                    phones[phone] = None
+        return list(emails), list(phones)
+
+
+@lru_cache(maxsize=32)
+def compile_scanner(email_pattern, phone_patterns):
+    """Verilen desen seti için tarayıcıyı bir kez derle (phone_patterns bir tuple olmalıdır)"""
+    return ContactScanner(email_pattern, phone_patterns)
+
+
+def get_scanner(email_pattern=None, phone_patterns=None):
+    """Arayüzden gelen desenler için tarayıcıyı döndür; boş bırakılanlar için varsayılanlar kullanılır"""
+    return compile_scanner(email_pattern or DEFAULT_EMAIL_PATTERN,
+                           tuple(phone_patterns or DEFAULT_PHONE_PATTERNS))
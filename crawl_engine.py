@@ -0,0 +1,523 @@
+import os
+import signal
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from functools import partial
+
+from company_scraper import (
+    find_website_via_google,
+    scrape_company_website,
+    fetch_homepage,
+    fetch_first_contact_page,
+    configure_contact_pool,
+    decode_html,
+    extract_homepage,
+    extract_contact_page,
+    merge_company_data,
+    requested_keys,
+    clean_url,
+    get_base_domain
+)
+from http_client import (
+    configure_session, close_session, add_response_observer, remove_response_observer, DEFAULT_SESSION_SETTINGS
+)
+from adaptive_concurrency import AimdController, AdaptiveGate
+from politeness import get_scheduler
+from search_cache import normalize_company_name
+from contact_scanner import get_scanner
+from parser_backend import configure_parser, get_parser
+from deadline import Deadline, DeadlineExceeded, Cancelled, CancelToken, current_deadline, deadline_scope, run_with_deadline
+
+# Arama motoru istekleri için kullanılan host anahtarı
+SEARCH_HOST = "www.bing.com"
+
+# Uyarlanabilir eşzamanlılık hedefleri: arama motoru daha düşük gecikme ve limitle başlar
+SEARCH_TARGET_P95 = 3.0
+SITE_TARGET_P95 = 8.0
+SEARCH_INITIAL_LIMIT = 1
+SITE_INITIAL_LIMIT = 8
+SITE_OVERLOAD_STATUSES = frozenset({429})
+
+
+def _init_extract_worker(parser_name):
+    """Ayrıştırma sürecinde ana süreçteki ayrıştırıcı seçimini uygula"""
+    # Ctrl+C yalnızca ana süreci durdurur; süreçler devam eden ayrıştırmaları tamamlar
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    configure_parser(parser_name)
+
+
+def _extract_homepage_task(content, encoding, url, keys, email_pattern, phone_patterns):
+    """Ayrıştırma sürecinde çalışır: ana sayfa verisi ve gerekiyorsa iletişim sayfası adayları"""
+    scanner = get_scanner(email_pattern, phone_patterns)
+    return extract_homepage(decode_html(content, encoding), url, keys, scanner=scanner)
+
+
+def _extract_contact_task(content, encoding, page_url, url, keys, email_pattern, phone_patterns):
+    """Ayrıştırma sürecinde çalışır: iletişim sayfası verisi"""
+    scanner = get_scanner(email_pattern, phone_patterns)
+    return extract_contact_page(decode_html(content, encoding), page_url, url, keys, scanner=scanner)
+
+
+def site_key(website):
+    """Aynı siteyi paylaşan satırları gruplamak için normalleştirilmiş alan adı (www. öneki atılır)"""
+    host = get_base_domain(clean_url(website)) or ""
+    host = host.rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+class CompanyJob:
+    """Taranacak tek bir firma satırı"""
+
+    def __init__(self, index, company_name, website=None):
+        self.index = index
+        self.company_name = company_name
+        self.website = website
+
+
+class CompanyResult:
+    """Bir firma için tarama sonucu"""
+
+    def __init__(self, job, website=None, data=None, searched=False, error=None, partial=None):
+        self.job = job
+        self.website = website
+        self.data = data or {}
+        self.searched = searched
+        self.error = error
+        # Süre bütçesi dolduğu için eksik kalan sonuçlarda nedeni
+        self.partial = partial
+
+
+class CrawlEngine:
+    """
+    Birden çok firmayı aynı anda tarayan asyncio motoru.
+
+    Ağ beklemeleri iş parçacıklarında yürütülür; aynı anda çalışan firma sayısı
+    global bir limitle, aynı host'a giden istekler ise host başına bir limitle sınırlandırılır.
+    İstekler arası gecikme yalnızca aynı host (veya arama motoru) için uygulanır.
+    Sonuçlar `scrape_company_website` ile aynı sözlük yapısındadır.
+
+    parse_processes > 0 (None: tüm çekirdekler) olduğunda tarama aşamalara ayrılır: iş parçacıkları
+    sayfaları indirir, ham içerik sınırlı bir kuyruk üzerinden ayrıştırma süreçlerine (HTML ayrıştırma
+    ve çıkarıcılar) gider, sonuçlar tek bir yazıcı aşamasında on_result'a iletilir. Kuyruklar dolduğunda
+    önceki aşama bekler; böylece bellekte tutulan sayfa ve sonuç sayısı sınırlı kalır.
+
+    company_budget verildiğinde her firma için arama, ana sayfa ve iletişim sayfası isteklerinin tamamı
+    bu süreyle (saniye) sınırlanır; süre satırın ilk isteği gönderildiğinde başlar. Süre dolan satırlar
+    elde edilen verilerle kısmi olarak döner.
+
+    stop() çalışan istekleri de iptal eder: host beklemeleri kesilir, yeni istek gönderilmez ve devam
+    eden satırlar beklenmeden bırakılır (kaydedilmezler, devam modunda yeniden taranırlar).
+
+    adaptive=True iken arama ve site istekleri için ayrı AIMD denetleyicileri eşzamanlılığı p95 gecikme
+    ve hata oranına göre ayarlar (en fazla max_concurrency); her değişiklikte
+    on_limit_change(controller, old, new, reason) çağrılır.
+    """
+
+    def __init__(self, max_concurrency=16, per_host_limit=2, search_enabled=True,
+                 result_index=0, email_pattern=None, phone_patterns=None,
+                 search_delay=None, site_delay=None, fields=None,
+                 parse_processes=0, parse_queue_size=None, adaptive=False, on_limit_change=None,
+                 company_budget=None):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.search_enabled = search_enabled
+        self.result_index = result_index
+        self.email_pattern = email_pattern
+        self.phone_patterns = phone_patterns
+        # E-posta ve telefon desenleri çalıştırma başına bir kez derlenir
+        self.scanner = get_scanner(email_pattern, phone_patterns)
+        # Doldurulacak çıktı sütunları (None: hepsi); istenmeyen alanlar için çıkarıcı çalıştırılmaz
+        self.fields = None if fields is None else frozenset(fields)
+        self.search_delay = search_delay
+        self.site_delay = site_delay
+        # Ayrıştırma süreci sayısı (0: sayfalar indirildikleri iş parçacığında ayrıştırılır)
+        if parse_processes is None:
+            parse_processes = os.cpu_count() or 1
+        self.parse_processes = max(0, int(parse_processes))
+        self.parse_queue_size = parse_queue_size or self.parse_processes * 2
+        self.company_budget = company_budget or None
+        self.adaptive = adaptive
+        self.on_limit_change = on_limit_change
+        self.search_controller = None
+        self.site_controller = None
+        self.running = False
+        self.logger = logging.getLogger("CrawlEngine")
+
+        self._cancel = CancelToken()
+        self._loop = None
+        self._workers = []
+        self._executor = None
+        self._process_pool = None
+        self._parse_queue = None
+        self._global_semaphore = None
+        self._gates = {}
+        self._host_semaphores = {}
+        self._search_tasks = {}
+        self._scrape_tasks = {}
+        self.deduplicated_searches = 0
+        self.deduplicated_scrapes = 0
+        self.saved_fetches = 0
+
+    def stop(self):
+        """Yeni firma başlatılmasını durdur ve devam eden istekleri iptal et (herhangi bir iş parçacığından)"""
+        self.running = False
+        self._cancel.cancel()
+        # Havuzdaki bağlantılar kapatılır; sonraki istekler yeni oturumla başlar
+        close_session()
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._abort)
+            except RuntimeError:
+                # Olay döngüsü zaten kapandı
+                pass
+
+    def _abort(self):
+        """Satırları ve paylaşılan işleri beklemeyi bırak; iş parçacıkları Cancelled ile kendiliğinden biter"""
+        for task in [*self._workers, *self._search_tasks.values(), *self._scrape_tasks.values()]:
+            task.cancel()
+
+    def _host_semaphore(self, host):
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    def _traffic(self, host):
+        return 'search' if host == SEARCH_HOST else 'site'
+
+    async def _call(self, host, func, *args, **kwargs):
+        """Bloklayan bir fonksiyonu host, uyarlanabilir ve global limitler altında iş parçacığında çalıştır"""
+        loop = asyncio.get_running_loop()
+        async with self._host_semaphore(host or ""):
+            async with self._gates.get(self._traffic(host)) or nullcontext():
+                async with self._global_semaphore:
+                    # Firmanın süre bütçesi ilk istek gönderilirken başlar (limit kuyruklarında geçen
+                    # süre sayılmaz) ve iş parçacığına aktarılır (http_get kontrol eder)
+                    deadline = current_deadline()
+                    if deadline is not None:
+                        deadline.start()
+                    return await loop.run_in_executor(
+                        self._executor, partial(run_with_deadline, deadline, func, *args, **kwargs)
+                    )
+
+    def _start_adaptive(self):
+        """Arama ve site trafiği için denetleyicileri oluştur ve HTTP yanıtlarını izlemeye başla"""
+        def notify(traffic):
+            def changed(controller, old, new, reason):
+                self._gates[traffic].limit_changed()
+                if self.on_limit_change:
+                    self.on_limit_change(controller, old, new, reason)
+            return changed
+
+        self.search_controller = AimdController(
+            "Arama", SEARCH_INITIAL_LIMIT, maximum=max(1, self.max_concurrency // 4),
+            target_p95=SEARCH_TARGET_P95, on_change=notify('search')
+        )
+        # Site denetleyicisi tüm sunucuların trafiğini görür: tek tek sitelerin zaman aşımları ve 5xx
+        # yanıtları o sitenin sorunudur, genel limiti düşürmez. Yalnızca 429 ve gecikme sayılır.
+        self.site_controller = AimdController(
+            "Site", min(SITE_INITIAL_LIMIT, self.max_concurrency), maximum=self.max_concurrency,
+            target_p95=SITE_TARGET_P95, on_change=notify('site'),
+            overload_statuses=SITE_OVERLOAD_STATUSES, overload_errors=()
+        )
+        self._gates = {
+            'search': AdaptiveGate(self.search_controller),
+            'site': AdaptiveGate(self.site_controller)
+        }
+        add_response_observer(self._observe)
+
+    def _observe(self, url, latency, status, error):
+        if self._traffic(get_base_domain(url)) == 'search':
+            self.search_controller.record(latency, status, error)
+        else:
+            self.site_controller.record(latency, status, error)
+
+    def concurrency_status(self):
+        """Güncel limitler ve son değişiklik nedenleri"""
+        if not self.adaptive or self.site_controller is None:
+            return f"{self.max_concurrency} (sabit)"
+        return f"{self.site_controller.status()} | {self.search_controller.status()}"
+
+    async def _shared(self, task, label, owner=False):
+        """
+        Paylaşılan işi bekle.
+
+        İşi başlatan satır (owner) için bütçeyi işin kendisi uygular (limit kuyruğunda süre işlemez);
+        aynı işi bekleyen diğer satırlarda bekleyen satırın kendi süre bütçesi de geçerlidir.
+        """
+        deadline = current_deadline()
+        if owner or deadline is None or not deadline.limited:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(0.0, deadline.remaining()))
+        except asyncio.TimeoutError:
+            raise deadline.exceeded(label)
+
+    def _search_counted(self, company_name):
+        website = find_website_via_google(company_name, result_index=self.result_index)
+        deadline = current_deadline()
+        return website, deadline.reason() if deadline else None
+
+    async def _search(self, company_name):
+        """
+        Firma web sitesini ara; aynı ada sahip satırlar tek bir aramayı paylaşır.
+
+        (web sitesi, kısmi sonuç nedeni) döndürür.
+        """
+        key = normalize_company_name(company_name)
+        task = self._search_tasks.get(key)
+        owner = task is None
+        if owner:
+            task = asyncio.ensure_future(self._call(SEARCH_HOST, self._search_counted, company_name))
+            self._search_tasks[key] = task
+        else:
+            self.deduplicated_searches += 1
+            self.logger.info(f"Aynı firma adı için yapılan arama sonucu kullanılıyor: {company_name}")
+        return await self._shared(task, "arama", owner)
+
+    def _scrape_counted(self, website):
+        stats = {}
+        data = scrape_company_website(website, scanner=self.scanner, fields=self.fields, stats=stats)
+        deadline = current_deadline()
+        return data, stats.get('fetches', 0), deadline.reason() if deadline else None
+
+    async def _extract(self, func, *args):
+        """Ayrıştırma işini kuyruğa koy ve sonucunu bekle (kuyruk doluysa yer açılana kadar bekler)"""
+        future = asyncio.get_running_loop().create_future()
+        await self._parse_queue.put((func, args, future))
+        return await future
+
+    async def _parse_worker(self):
+        """Kuyruktaki sayfaları ayrıştırma süreçlerine gönder (süreç başına bir iş)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            func, args, future = await self._parse_queue.get()
+            try:
+                result = await loop.run_in_executor(self._process_pool, func, *args)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self._parse_queue.task_done()
+
+    async def _scrape_staged(self, website):
+        """scrape_company_website'ın aşamalı karşılığı: indirme iş parçacığında, ayrıştırma süreçte"""
+        url = clean_url(website)
+        host = get_base_domain(url)
+        keys = requested_keys(self.fields)
+        patterns = (self.email_pattern, tuple(self.phone_patterns or ()))
+        deadline = current_deadline()
+        fetches = 0
+        try:
+            response = await self._call(host, fetch_homepage, url)
+            fetches += 1
+            if response is None:
+                return {}, fetches, None
+            main_data, contact_urls = await self._extract(
+                _extract_homepage_task, response.content, response.encoding, url, keys, *patterns
+            )
+            contact_data = {}
+            if contact_urls:
+                contact_response = await self._call(host, fetch_first_contact_page, contact_urls)
+                if contact_response is not None:
+                    fetches += 1
+                    contact_data = await self._extract(
+                        _extract_contact_task, contact_response.content, contact_response.encoding,
+                        contact_response.url, url, keys, *patterns
+                    )
+            return merge_company_data(main_data, contact_data), fetches, deadline.reason() if deadline else None
+        except DeadlineExceeded as e:
+            return {}, fetches, str(e)
+        except (Cancelled, BrokenProcessPool):
+            # Satır hatalı kaydedilir (devam modunda yeniden denenir)
+            raise
+        except Exception as e:
+            self.logger.error(f"{url} taranırken hata: {e}")
+            return {}, fetches, None
+
+    async def _scrape(self, website):
+        """
+        Web sitesini tara; aynı alan adını paylaşan satırlar tek bir taramayı paylaşır.
+
+        (veri, kısmi sonuç nedeni) döndürür.
+        """
+        key = site_key(website)
+        task = self._scrape_tasks.get(key)
+        if task is None:
+            if self._process_pool is not None:
+                task = asyncio.ensure_future(self._scrape_staged(website))
+            else:
+                task = asyncio.ensure_future(self._call(
+                    get_base_domain(clean_url(website)),
+                    self._scrape_counted, website
+                ))
+            self._scrape_tasks[key] = task
+            data, _, reason = await self._shared(task, "site taraması", owner=True)
+            return data, reason
+        data, fetches, reason = await self._shared(task, "paylaşılan site taraması")
+        self.deduplicated_scrapes += 1
+        self.saved_fetches += fetches
+        self.logger.info(f"Aynı alan adı için yapılan tarama sonucu kullanılıyor: {website} ({key})")
+        # Her satır kendi kopyasını alır
+        return {name: list(value) if isinstance(value, list) else value for name, value in data.items()}, reason
+
+    async def process_company(self, job):
+        """Tek bir firma için gerekirse arama yap ve web sitesini tara"""
+        website = job.website
+        searched = False
+        data = {}
+        reason = None
+        # Süre sınırı olmasa da bütçe durdurma işaretini iş parçacıklarına taşır;
+        # süre satırın ilk isteği gönderildiğinde başlar (_call)
+        deadline = Deadline(self.company_budget, self._cancel, started=False)
+
+        with deadline_scope(deadline):
+            try:
+                if not website and self.search_enabled:
+                    searched = True
+                    website, reason = await self._search(job.company_name)
+
+                if website and (self.fields is None or self.fields) and not reason:
+                    data, reason = await self._scrape(website)
+
+                reason = reason or deadline.reason()
+            except DeadlineExceeded as e:
+                reason = str(e)
+            except Cancelled:
+                raise
+            except Exception as e:
+                self.logger.error(f"{job.company_name} işlenirken hata: {e}")
+                return CompanyResult(job, website, {}, searched, error=str(e))
+
+        return CompanyResult(job, website, data, searched, partial=reason)
+
+    async def run_async(self, jobs, on_start=None, on_result=None):
+        """
+        Firmaları eşzamanlı işle.
+
+        Args:
+            jobs: CompanyJob listesi
+            on_start: Bir firma başlatıldığında çağrılır (job)
+            on_result: Bir firma bittiğinde tek bir yazıcı iş parçacığında sırayla çağrılır (CompanyResult)
+
+        Returns:
+            Tamamlanan CompanyResult listesi (bitiş sırasına göre)
+        """
+        # Başlamadan önce stop() çağrıldıysa hiçbir firma başlatılmaz
+        self.running = not self._cancel.cancelled
+        self._loop = asyncio.get_running_loop()
+        # Aynı host'a giden istekler arası aralıkları ayarla (diğer host'lar beklemez)
+        get_scheduler().configure(site_interval=self.site_delay, search_interval=self.search_delay)
+        # Bağlantı havuzunu eşzamanlılığa göre boyutlandır
+        configure_session(
+            pool_connections=max(DEFAULT_SESSION_SETTINGS['pool_connections'], self.max_concurrency * 2),
+            pool_maxsize=max(DEFAULT_SESSION_SETTINGS['pool_maxsize'], self.per_host_limit * 4)
+        )
+        # İletişim sayfası adayları da eşzamanlı firma sayısına göre boyutlanan havuzda indirilir
+        configure_contact_pool(self.max_concurrency)
+        self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores = {}
+        self._search_tasks = {}
+        self._scrape_tasks = {}
+        self.deduplicated_searches = 0
+        self.deduplicated_scrapes = 0
+        self.saved_fetches = 0
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._gates = {}
+        if self.adaptive:
+            self._start_adaptive()
+        parse_tasks = []
+        if self.parse_processes:
+            # spawn: iş parçacıkları çalışırken fork edilen süreçlerde kilitler kopyalanmaz
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.parse_processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_extract_worker,
+                initargs=(get_parser(),)
+            )
+            self._parse_queue = asyncio.Queue(maxsize=self.parse_queue_size)
+            parse_tasks = [asyncio.ensure_future(self._parse_worker()) for _ in range(self.parse_processes)]
+            self.logger.info(f"Ayrıştırma {self.parse_processes} süreçte yapılıyor (kuyruk: {self.parse_queue_size} sayfa)")
+
+        loop = asyncio.get_running_loop()
+        writer_executor = ThreadPoolExecutor(max_workers=1)
+        result_queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+        writer_errors = []
+        job_iter = iter(jobs)
+        results = []
+
+        async def worker():
+            while self.running:
+                job = next(job_iter, None)
+                if job is None:
+                    return
+                if on_start:
+                    on_start(job)
+                try:
+                    result = await self.process_company(job)
+                except Cancelled:
+                    return
+                if self._cancel.cancelled:
+                    # Durdurma sırasında biten satırlar eksik olabilir; kaydedilmez
+                    return
+                # Yazıcı geride kalırsa yeni firma başlatılmaz
+                await result_queue.put(result)
+
+        async def writer():
+            """Sonuçları tek iş parçacığında sırayla yaz"""
+            while True:
+                result = await result_queue.get()
+                if result is None:
+                    return
+                results.append(result)
+                if on_result and not writer_errors:
+                    try:
+                        await loop.run_in_executor(writer_executor, on_result, result)
+                    except Exception as e:
+                        # Yazılamayan sonuçlardan sonra yeni firma başlatılmaz
+                        writer_errors.append(e)
+                        self.running = False
+
+        writer_task = asyncio.ensure_future(writer())
+        self._workers = [asyncio.ensure_future(worker()) for _ in range(self.max_concurrency)]
+        try:
+            # Durdurulduğunda iptal edilen satırlar atlanır; yazıcı o ana kadarki sonuçları hemen yazar
+            outcomes = await asyncio.gather(*self._workers, return_exceptions=True)
+            errors = [e for e in outcomes if isinstance(e, Exception)]
+            if errors:
+                raise errors[0]
+            await result_queue.put(None)
+            await writer_task
+        finally:
+            remove_response_observer(self._observe)
+            self._loop = None
+            self._workers = []
+            if self._cancel.cancelled:
+                # Motor yeniden çalıştırılabilir; eski iş parçacıkları iptal edilmiş işareti tutar
+                self._cancel = CancelToken()
+            writer_task.cancel()
+            for task in parse_tasks:
+                task.cancel()
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+            writer_executor.shutdown(wait=True)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.running = False
+
+        if writer_errors:
+            raise writer_errors[0]
+        return results
+
+    def run(self, jobs, on_start=None, on_result=None):
+        """run_async için senkron sarmalayıcı"""
+        return asyncio.run(self.run_async(jobs, on_start=on_start, on_result=on_result))
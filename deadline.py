@@ -0,0 +1,147 @@
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Firma için ayrılan süre doldu"""
+
+
+class Cancelled(Exception):
+    """İşlem kullanıcı tarafından durduruldu"""
+
+
+class CancelToken:
+    """Çalıştırma boyunca paylaşılan iptal işareti; beklemeler iptal edilince hemen uyanır"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """İptal edildiyse Cancelled ver"""
+        if self._event.is_set():
+            raise Cancelled("İşlem durduruldu")
+
+    def wait(self, seconds):
+        """En fazla verilen süre kadar bekle; iptal edilince hemen döner"""
+        return self._event.wait(seconds)
+
+
+class Deadline:
+    """
+    Bir firmanın tüm aşamaları (arama, ana sayfa, iletişim sayfası) için ortak süre bütçesi.
+
+    İptal işbirliğine dayanır: `http_get` her istekten önce bütçeyi kontrol eder ve zaman aşımını
+    kalan süreyle sınırlar; süre dolduysa DeadlineExceeded verir. seconds=None sınırsız bütçedir.
+    started=False verilirse süre start() çağrılana kadar işlemez (ör. satır kuyrukta beklerken).
+    Bir CancelToken verilirse aynı kontrol noktaları durdurma isteğinde Cancelled verir ve
+    bekleme süreleri (`sleep`) iptal edildiği anda kesilir.
+    """
+
+    def __init__(self, seconds=None, token=None, started=True):
+        self.seconds = seconds
+        self.expires = None
+        self.token = token
+        self.exceeded_at = None
+        if started:
+            self.start()
+
+    @property
+    def limited(self):
+        return self.seconds is not None
+
+    def start(self):
+        """Süreyi başlat (zaten başladıysa bir şey yapmaz)"""
+        if self.expires is None:
+            self.expires = time.monotonic() + self.seconds if self.seconds else float('inf')
+
+    def remaining(self):
+        if self.expires is None:
+            return self.seconds if self.seconds else float('inf')
+        return self.expires - time.monotonic()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def exceeded(self, label):
+        """Sürenin nerede dolduğunu kaydet ve verilecek istisnayı döndür"""
+        if self.exceeded_at is None:
+            self.exceeded_at = label
+        return DeadlineExceeded(self.reason())
+
+    def check(self, label):
+        """Durdurulduysa Cancelled, süre dolduysa DeadlineExceeded ver"""
+        if self.token is not None:
+            self.token.check()
+        if self.expired():
+            raise self.exceeded(label)
+
+    def clamp(self, timeout, label):
+        """İstek zaman aşımını kalan süreyle sınırla"""
+        self.check(label)
+        if not self.limited:
+            return timeout
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def sleep(self, seconds, label):
+        """Kalan süreyi aşmadan bekle; durdurulunca hemen uyanır"""
+        seconds = min(seconds, max(0.0, self.remaining()))
+        if self.token is not None:
+            self.token.wait(seconds)
+        else:
+            time.sleep(seconds)
+        self.check(label)
+
+    def reason(self):
+        """Süre dolduysa kısmi sonucun nedeni, dolmadıysa None"""
+        if self.exceeded_at is None and not self.expired():
+            return None
+        where = f": {self.exceeded_at}" if self.exceeded_at else ""
+        return f"{self.seconds:g} sn süre sınırı aşıldı{where}"
+
+
+def current_deadline():
+    """Çalışan firmanın süre bütçesi (yoksa None)"""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline):
+    """Bu blokta (ve bu bağlamda çalışan kodda) verilen bütçeyi geçerli kıl"""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def run_with_deadline(deadline, func, *args, **kwargs):
+    """Fonksiyonu verilen bütçeyle çalıştır (iş parçacıklarına bütçe aktarmak için)"""
+    with deadline_scope(deadline):
+        return func(*args, **kwargs)
+
+
+def sleep(seconds, label):
+    """Geçerli bütçe varsa ona bağlı (kesilebilir) bekleme, yoksa time.sleep"""
+    deadline = _current.get()
+    if deadline is None:
+        time.sleep(seconds)
+    else:
+        deadline.sleep(seconds, label)
+
+
+def clamp_timeout(timeout, label):
+    """Geçerli bütçe varsa zaman aşımını kalan süreyle sınırla; süre dolduysa DeadlineExceeded ver"""
+    deadline = _current.get()
+    return timeout if deadline is None else deadline.clamp(timeout, label)
@@ -0,0 +1,124 @@
+import os
+import gzip
+import json
+import time
+import queue
+import atexit
+import threading
+import logging
+
+DEFAULT_DEBUG_DIR = "debug_archive"
+DEFAULT_DEBUG_MAX_BYTES = 100 * 1024 * 1024   # Arşivde tutulacak en fazla (sıkıştırılmış) veri
+
+# Yazıcı iş parçacığı yetişemezse bekleyen kayıt sayısı bu sınırı aşmaz; fazlası atılır
+_MAX_PENDING = 1000
+
+logger = logging.getLogger("DebugArchive")
+
+
+class DebugArchive:
+    """
+    Hata ayıklama için indirilen sayfaları saklayan sıkıştırılmış arşiv.
+
+    Her sayfa `archive.gz` dosyasının sonuna ayrı bir gzip üyesi olarak eklenir ve
+    konumu `archive.idx` (JSON satırları) dosyasına yazılır; böylece dosya `gzip -dc`
+    ile bütün olarak da, dizin üzerinden tek tek de okunabilir. Yazma işlemi arka plandaki
+    bir iş parçacığında yapılır. Arşiv boyut sınırının yarısını geçtiğinde `.1` uzantısıyla
+    bir kenara alınır ve en fazla bir eski arşiv tutulur.
+    """
+
+    def __init__(self, directory=DEFAULT_DEBUG_DIR, max_bytes=DEFAULT_DEBUG_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.data_path = os.path.join(directory, "archive.gz")
+        self.index_path = os.path.join(directory, "archive.idx")
+        os.makedirs(directory, exist_ok=True)
+
+        self._queue = queue.Queue(maxsize=_MAX_PENDING)
+        self._thread = threading.Thread(target=self._writer, name="debug-archive", daemon=True)
+        self._thread.start()
+
+    def capture(self, kind, content, **meta):
+        """Sayfayı arşive eklenmek üzere kuyruğa al (çağıranı bekletmez)"""
+        try:
+            self._queue.put_nowait((kind, content, meta, time.time()))
+        except queue.Full:
+            logger.warning("Hata ayıklama arşivi kuyruğu dolu, kayıt atlandı")
+
+    def _writer(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self._append(*item)
+            except Exception as e:
+                logger.error(f"Hata ayıklama arşivine yazılamadı: {e}")
+
+    def _append(self, kind, content, meta, captured_at):
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        member = gzip.compress(content, compresslevel=6)
+
+        offset = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        if offset + len(member) > self.max_bytes / 2:
+            self._rotate()
+            offset = 0
+
+        with open(self.data_path, 'ab') as f:
+            f.write(member)
+        record = dict(meta, kind=kind, time=captured_at, offset=offset, length=len(member))
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def _rotate(self):
+        """Mevcut arşivi .1 olarak sakla, daha eskisini sil"""
+        for path in (self.data_path, self.index_path):
+            if os.path.exists(path):
+                os.replace(path, path + '.1')
+
+    def close(self):
+        """Bekleyen kayıtları yaz ve iş parçacığını durdur"""
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+
+def iter_archive(directory=DEFAULT_DEBUG_DIR):
+    """Arşivdeki kayıtları (eskiden yeniye) (meta, içerik) olarak döndür"""
+    for suffix in ('.1', ''):
+        data_path = os.path.join(directory, "archive.gz" + suffix)
+        index_path = os.path.join(directory, "archive.idx" + suffix)
+        if not (os.path.exists(data_path) and os.path.exists(index_path)):
+            continue
+        with open(index_path, encoding='utf-8') as index, open(data_path, 'rb') as data:
+            for line in index:
+                record = json.loads(line)
+                data.seek(record['offset'])
+                yield record, gzip.decompress(data.read(record['length']))
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def configure_debug_capture(enabled=False, directory=DEFAULT_DEBUG_DIR, max_bytes=DEFAULT_DEBUG_MAX_BYTES):
+    """Hata ayıklama kaydını aç/kapat (varsayılan olarak kapalıdır)"""
+    global _archive
+    with _archive_lock:
+        old_archive, _archive = _archive, None
+        if enabled:
+            _archive = DebugArchive(directory, max_bytes=max_bytes)
+    if old_archive is not None:
+        old_archive.close()
+
+
+def capture_debug(kind, content, **meta):
+    """Hata ayıklama kaydı açıksa sayfayı arşive ekle"""
+    archive = _archive
+    if archive is not None and content:
+        archive.capture(kind, content, **meta)
+
+
+@atexit.register
+def _flush_on_exit():
+    configure_debug_capture(enabled=False)
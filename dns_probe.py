@@ -0,0 +1,170 @@
+import re
+import time
+import socket
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+
+DEFAULT_POSITIVE_TTL = 3600      # Çözülen adlar bu süre boyunca tekrar sorulmaz
+DEFAULT_NEGATIVE_TTL = 600       # Çözülemeyen adlar da (daha kısa süre) hatırlanır
+DEFAULT_PROBE_TIMEOUT = 3.0      # Tüm adaylar için toplam bekleme süresi
+MAX_LOOKUP_WORKERS = 8           # Tek bir firma için aynı anda çözülen aday sayısı
+
+# Türkçe karakterleri alan adlarında kullanılan ASCII karşılıklarına çevir
+_TURKISH_FOLD = str.maketrans('çğıöşüâîûÇĞIİÖŞÜÂÎÛ', 'cgiosuaiucgiiosuaiu')
+
+# Alan adında genellikle yer almayan şirket türü ekleri
+_LEGAL_WORDS = {
+    'as', 'a', 's', 'ltd', 'sti', 'limited', 'sirketi', 'san', 've', 'tic', 'ticaret',
+    'sanayi', 'inc', 'co', 'corp', 'llc', 'gmbh', 'holding'
+}
+
+_TLDS = ['.com', '.com.tr', '.net', '.org']
+# Ekleri atılmış kısa adlar başka firmalara ait olabilir; yalnızca bu uzantılarla ve tam adlardan sonra denenir
+_CORE_TLDS = ['.com', '.com.tr']
+
+logger = logging.getLogger("DnsProbe")
+
+
+def _valid_labels(labels, exclude=()):
+    valid = []
+    for label in labels:
+        if (label and label not in valid and label not in exclude and len(label) <= 63 and
+                re.fullmatch(r'[a-z0-9](?:[a-z0-9-]*[a-z0-9])?', label)):
+            valid.append(label)
+    return valid
+
+
+def _domain_labels(company_name):
+    """
+    Firma adından olası alan adı etiketlerini öncelik sırasıyla üret.
+
+    (tam ad etiketleri, şirket türü ekleri atılmış etiketler) döndürür; ikinci listede birincide
+    bulunan etiketler yer almaz.
+    """
+    name = str(company_name).lower()
+
+    # Katlama lower() öncesinde yapılır; aksi halde 'İ' birleşik noktalı 'i̇' olur
+    words = re.findall(r'[a-z0-9]+', str(company_name).translate(_TURKISH_FOLD).lower())
+    core_words = [w for w in words if w not in _LEGAL_WORDS] or words
+
+    # Önceki davranış (sadece boşlukları kaldır) önce gelir
+    full = _valid_labels([name.replace(' ', ''), ''.join(words), '-'.join(words)])
+    core = _valid_labels([''.join(core_words), '-'.join(core_words)], exclude=full)
+    return full, core
+
+
+def candidate_domains(company_name):
+    """
+    Firma adı için tahmin edilen alan adlarını öncelik sırasıyla döndür.
+
+    Türkçe karakterler ASCII'ye çevrilir; bitişik ve tireli yazımlar .com/.com.tr/.net/.org
+    uzantılarıyla denenir. Şirket türü ekleri atılmış kısa adlar ("Koç Holding A.Ş." için "koc")
+    başka firmalara ait olabileceğinden tüm tam ad adaylarından sonra ve yalnızca .com/.com.tr ile
+    denenir. Sonda www. varyantları gelir.
+    """
+    full, core = _domain_labels(company_name)
+    domains = [label + tld for tld in _TLDS for label in full]
+    domains += [label + tld for tld in _CORE_TLDS for label in core]
+    # www. varyantları sona (önceki davranıştaki gibi yalnızca .com ve .com.tr için)
+    return domains + ['www.' + domain for domain in domains if domain.endswith(('.com', '.com.tr'))]
+
+
+class CachingResolver:
+    """
+    Olumlu ve olumsuz yanıtları TTL ile saklayan, eşzamanlı çalışan DNS çözücü.
+
+    Her first_resolvable çağrısı kendi küçük havuzunu kullanır; böylece bir firmanın öncelikli
+    adayları başka firmaların adaylarının arkasında kuyrukta beklemez.
+    """
+
+    def __init__(self, positive_ttl=DEFAULT_POSITIVE_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_workers=MAX_LOOKUP_WORKERS):
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_workers = max_workers
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, host):
+        with self._lock:
+            entry = self._cache.get(host)
+        if entry and entry[1] > time.monotonic():
+            return entry
+        return None
+
+    def resolve(self, host):
+        """Host çözülebiliyorsa True döndür (önbellekten veya DNS'ten)"""
+        entry = self._cached(host)
+        if entry is not None:
+            return entry[0]
+        try:
+            socket.getaddrinfo(host, None)
+            resolved = True
+        except (socket.gaierror, UnicodeError, OSError):
+            resolved = False
+        ttl = self.positive_ttl if resolved else self.negative_ttl
+        with self._lock:
+            self._cache[host] = (resolved, time.monotonic() + ttl)
+        return resolved
+
+    def first_resolvable(self, hosts, timeout=DEFAULT_PROBE_TIMEOUT):
+        """
+        Tüm adayları aynı anda çöz ve listede önce gelen ilk çözülebilir adı döndür.
+
+        Öncelikli adaylar sonuçlanana kadar beklenir; toplam süre timeout ile sınırlıdır. Süre
+        dolduğunda o ana kadar çözülmüş adlardan listede en önce geleni döndürülür.
+        """
+        # Önbellek girdisi bir kez okunur (kontrol ile okuma arasında süresi dolabilir)
+        results = {host: self._cached(host) for host in hosts}
+        pending = [host for host in hosts if results[host] is None]
+        executor = None
+        if pending:
+            executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending)), thread_name_prefix='dns')
+            for host in pending:
+                results[host] = executor.submit(self.resolve, host)
+
+        deadline = time.monotonic() + timeout
+        try:
+            for host in hosts:
+                result = results[host]
+                if isinstance(result, tuple):
+                    resolved = result[0]
+                else:
+                    try:
+                        resolved = result.result(timeout=max(0.0, deadline - time.monotonic()))
+                    except FuturesTimeout:
+                        logger.info("DNS denemeleri zaman aşımına uğradı, çözülmüş adaylar kullanılıyor")
+                        return self._best_resolved(hosts, results)
+                if resolved:
+                    return host
+            return None
+        finally:
+            if executor is not None:
+                # Sonuçlanmamış denemeler arka planda biter ve önbelleğe yazılır
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _best_resolved(hosts, results):
+        """Sonucu belli olan adaylardan listede önce gelen çözülebilir ad"""
+        for host in hosts:
+            result = results[host]
+            if isinstance(result, tuple):
+                if result[0]:
+                    return host
+            elif result.done() and not result.cancelled() and result.exception() is None and result.result():
+                return host
+        return None
+
+
+_resolver = CachingResolver()
+
+
+def get_resolver():
+    """Paylaşılan DNS çözücüyü döndür"""
+    return _resolver
+
+
+def find_domain_by_dns(company_name, timeout=DEFAULT_PROBE_TIMEOUT):
+    """Firma adından tahmin edilen alan adlarından çözülebilen ilkini döndür"""
+    return _resolver.first_resolvable(candidate_domains(company_name), timeout=timeout)
@@ -2,33 +2,34 @@ import os
 import json
 import logging
 from typing import Dict, Any, Optional
-from gemini_client import GeminiClient
+from gemini_client import get_client
 
 class EmailGenerator:
     def __init__(self):
-        # GeminiClient'ı kullanarak API yapılandırması
-        self.gemini_client = GeminiClient()
-        # API durumu
-        self.is_configured = False
+        # Süreç genelinde paylaşılan istemci (anahtar ve promptlar bir kez yüklenir)
+        self.gemini_client = get_client()
         # Logger oluştur
         self.logger = logging.getLogger("EmailGenerator")
         self._load_api_key()
+
+    @property
+    def is_configured(self) -> bool:
+        """API durumu (anahtar ilk istekte reddedilirse False olur)"""
+        return self.gemini_client.is_configured
         
     def _load_api_key(self):
-        """API anahtarını dosyadan yüklemeyi dene"""
-        self.gemini_client._load_api_key_from_file()
-        self.is_configured = self.gemini_client.is_configured
+        """Paylaşılan istemcide anahtar yoksa dosyadan yüklemeyi dene"""
+        if not self.gemini_client.is_configured:
+            self.gemini_client._load_api_key_from_file()
         
     def load_prompts(self) -> None:
         """JSON dosyasından tüm promptları yükle"""
-        # GeminiClient zaten promptları yükleyecek
+        # Promptlar paylaşılır; prompts.json değiştiyse yeniden yüklenir
         self.gemini_client.load_prompts()
             
     def configure(self, api_key: str, model: str = "gemini-1.0-pro") -> bool:
         """Configure the API key and model"""
-        success = self.gemini_client.set_api_key(api_key, model)
-        self.is_configured = success
-        return success
+        return self.gemini_client.set_api_key(api_key, model)
         
     def get_prompt(self, prompt_key: str, replacements: Dict[str, str] = None) -> str:
         """Belirtilen prompt'u getir ve değişkenleri doldur"""
@@ -1,36 +1,36 @@
 import os
 import google.generativeai as genai
 import logging
-from gemini_client import GeminiClient
+from gemini_client import get_client
 
 class GeminiEmailGenerator:
     """Gemini API kullanarak firma bilgilerine göre e-posta şablonu oluşturan sınıf"""
     
     def __init__(self):
-        # GeminiClient'ı kullanarak API yapılandırması yapacağız
-        self.client = GeminiClient()
-        # Durumu al
-        self.api_key = self.client.api_key
-        self.is_configured = self.client.is_configured
+        # Süreç genelinde paylaşılan istemci (anahtar ve promptlar bir kez yüklenir)
+        self.client = get_client()
         self.logger = logging.getLogger("Gemini_API")
         
-        # Dosyadan API anahtarını yüklemeyi dene
+        # Dosyadan API anahtarını yüklemeyi dene (anahtar ilk istekte doğrulanır)
         if not self.is_configured:
             self._load_api_key_from_file()
+
+    @property
+    def api_key(self):
+        return self.client.api_key
+
+    @property
+    def is_configured(self):
+        # İlk istekte anahtar reddedilirse istemciyle birlikte False olur
+        return self.client.is_configured
     
     def _load_api_key_from_file(self):
         """Dosyadan API anahtarını yükle"""
         self.client._load_api_key_from_file()
-        self.api_key = self.client.api_key
-        self.is_configured = self.client.is_configured
     
-    def set_api_key(self, api_key, model=None):
-        """API anahtarını ayarla ve yapılandırmayı doğrula"""
-        success = self.client.set_api_key(api_key, model)
-        if success:
-            self.api_key = self.client.api_key
-            self.is_configured = True
-        return success
+    def set_api_key(self, api_key, model=None, validate=False):
+        """API anahtarını ayarla; validate=True ise hemen doğrula"""
+        return self.client.set_api_key(api_key, model, validate=validate)
     
     def analyze_company_info(self, company_info):
         """Firma bilgilerini analiz eder ve bir özet rapor döndürür"""
@@ -1,7 +1,133 @@
 import os
 import json
+import time
+import hashlib
 import logging
+import threading
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from http_cache import DEFAULT_CACHE_DIR
+
+# İçerik üretiminde kullanılan varsayılan ayarlar
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 2048,
+}
+
+SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
+
+PROMPT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts.json")
+
+KEY_VALIDATION_TTL = 24 * 3600   # Doğrulanan API anahtarı bu süre boyunca yeniden denetlenmez
+
+
+def is_key_error(error):
+    """Hata geçersiz / yetkisiz API anahtarından mı kaynaklanıyor"""
+    if isinstance(error, (google_exceptions.PermissionDenied, google_exceptions.Unauthenticated)):
+        return True
+    return isinstance(error, google_exceptions.InvalidArgument) and "API key" in str(error)
+
+
+class KeyValidationCache:
+    """
+    Doğrulanmış API anahtarlarının disk kaydı (anahtarın kendisi değil, SHA-256 özeti saklanır).
+
+    Her kayıt doğrulama zamanını ve seçilen modeli tutar; TTL dolana kadar açılışta ağa çıkılmaz.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=KEY_VALIDATION_TTL):
+        self.path = os.path.join(cache_dir, "api_keys.json")
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_hash(api_key):
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, records):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        os.replace(temp_path, self.path)
+
+    def get(self, api_key):
+        """Süresi dolmamış doğrulama kaydı (yoksa None)"""
+        with self._lock:
+            record = self._read().get(self.key_hash(api_key))
+        if record is None or time.time() - record.get("validated_at", 0) >= self.ttl:
+            return None
+        return record
+
+    def store(self, api_key, model):
+        with self._lock:
+            records = self._read()
+            records[self.key_hash(api_key)] = {"validated_at": time.time(), "model": model}
+            self._write(records)
+
+    def forget(self, api_key):
+        with self._lock:
+            records = self._read()
+            if records.pop(self.key_hash(api_key), None) is not None:
+                self._write(records)
+
+
+class PromptStore:
+    """
+    prompts.json içeriği; dosya yalnızca diskte değiştiğinde (mtime/boyut) yeniden okunur.
+
+    İş parçacığı güvenlidir; tüm istemciler aynı ayrıştırılmış sözlüğü paylaşır.
+    """
+
+    def __init__(self, path=PROMPT_FILE):
+        self.path = path
+        self.prompts = {}
+        self._signature = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger("GeminiAPI")
+
+    def get(self):
+        """Güncel promptları döndür (dosya değiştiyse önce yeniden yükle)"""
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return self.prompts
+        with self._lock:
+            if signature != self._signature:
+                self._load(signature)
+            return self.prompts
+
+    def _load(self, signature):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.prompts = json.load(f)
+            self.logger.info("Promptlar başarıyla yüklendi")
+        except Exception as e:
+            self.logger.error(f"Promptlar yüklenirken hata: {e}")
+            # Dosya bulunamazsa varsayılan prompt kullanılacak
+            self.prompts = {}
+        self._signature = signature
+
+
+_prompt_store = PromptStore()
+
 
 class GeminiClient:
     """Google Gemini API ile etkileşim kuracak temel sınıf"""
@@ -10,21 +136,24 @@ class GeminiClient:
         self.api_key = None
         self.model = "gemini-pro"  # Güncel model adı
         self.is_configured = False
-        self.prompts = {}
+        # Anahtar ilk gerçek istekte (veya validate() ile) doğrulanır
+        self.is_validated = False
+        self.validation_cache = KeyValidationCache()
+        self._validate_lock = threading.Lock()
         self.logger = logging.getLogger("GeminiAPI")
+        # (model, ayarlar, sistem talimatı) başına bir kez oluşturulan model nesneleri
+        self._models = {}
+        self._models_lock = threading.Lock()
         self.load_prompts()
+
+    @property
+    def prompts(self):
+        """Tüm istemcilerin paylaştığı promptlar (prompts.json değiştiyse yeniden yüklenir)"""
+        return _prompt_store.get()
         
     def load_prompts(self):
-        """JSON dosyasından tüm promptları yükle"""
-        try:
-            prompt_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts.json")
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                self.prompts = json.load(f)
-            self.logger.info("Promptlar başarıyla yüklendi")
-        except Exception as e:
-            self.logger.error(f"Promptlar yüklenirken hata: {e}")
-            # Dosya bulunamazsa varsayılan prompt kullanılacak
-            self.prompts = {}
+        """JSON dosyasındaki promptları yükle (dosya değişmediyse önceki yükleme kullanılır)"""
+        return _prompt_store.get()
     
     def _load_api_key_from_file(self):
         """Dosyadan API anahtarını yükleme"""
@@ -55,8 +184,13 @@ class GeminiClient:
             self.logger.error(f"API anahtarı yüklenirken hata oluştu: {str(e)}")
         return False
                 
-    def set_api_key(self, api_key, model=None):
-        """API anahtarını ayarla ve yapılandırmayı doğrula"""
+    def set_api_key(self, api_key, model=None, validate=False):
+        """
+        API anahtarını ayarla.
+
+        Doğrulama ağa çıkmadan ertelenir: anahtar son KEY_VALIDATION_TTL içinde doğrulandıysa diskteki
+        kayıt kullanılır, aksi halde ilk istekte doğrulanır. validate=True anahtarı hemen denetler.
+        """
         if not api_key:
             self.logger.error("API anahtarı boş olamaz")
             return False
@@ -68,53 +202,87 @@ class GeminiClient:
                 
             # Google Gemini API yapılandırması
             genai.configure(api_key=self.api_key)
-            
-            # Kullanılabilir modelleri listele ve doğrula
-            try:
-                # Mevcut modelleri kontrol et
-                available_models = [m.name for m in genai.list_models()]
-                self.logger.info(f"Kullanılabilir modeller: {available_models}")
-                
-                # En iyi model eşleşmesini bul
-                if "gemini-pro" in available_models:
-                    self.model = "gemini-pro"
-                elif "gemini-1.5-pro" in available_models:
-                    self.model = "gemini-1.5-pro"
-                elif "gemini-1.5-flash" in available_models:
-                    self.model = "gemini-1.5-flash"
-                else:
-                    # Varsayılan olarak ilk gemini modelini kullan
-                    for model_name in available_models:
-                        if "gemini" in model_name:
-                            self.model = model_name
-                            break
-                
-                self.logger.info(f"Seçilen model: {self.model}")
-            except Exception as e:
-                self.logger.warning(f"Model listesi alınamadı: {e}. Varsayılan model kullanılacak: {self.model}")
-            
-            # API yapılandırmasını test et
-            model = genai.GenerativeModel(self.model)
-            response = model.generate_content("Merhaba, bu bir test mesajıdır.")
-            if response:
-                self.is_configured = True
-                self.logger.info(f"Gemini API başarıyla yapılandırıldı, model: {self.model}")
-                return True
+            self.clear_model_cache()
+            self.is_configured = True
+            self.is_validated = False
+
+            record = self.validation_cache.get(api_key)
+            if record:
+                self.model = record.get("model") or self.model
+                self.is_validated = True
+                self.logger.info(f"Gemini API yapılandırıldı (önceden doğrulanmış anahtar), model: {self.model}")
+            elif validate:
+                return self.validate()
             else:
-                self.logger.error("API anahtarı geçerli değil veya API yanıt vermedi")
-                return False
+                self.logger.info("Gemini API anahtarı ayarlandı, ilk istekte doğrulanacak")
+            return True
         except Exception as e:
             self.logger.error(f"API yapılandırılırken hata oluştu: {str(e)}")
             self.is_configured = False
             return False
+
+    def validate(self):
+        """
+        Anahtarı model listesiyle doğrula ve kullanılacak modeli seç (ücretlendirilen bir istek gönderilmez).
+
+        Anahtar reddedilirse yapılandırma kaldırılır ve False döner. Ağ hatasında anahtar geçersiz
+        sayılmaz; ilk gerçek istek sonucu belirler.
+        """
+        if self.is_validated or not self.is_configured:
+            return self.is_configured
+        with self._validate_lock:
+            # Eşzamanlı ilk istekler doğrulamayı bir kez yapar
+            if self.is_validated or not self.is_configured:
+                return self.is_configured
+            return self._validate()
+
+    def _validate(self):
+        try:
+            available_models = [m.name for m in genai.list_models()]
+        except Exception as e:
+            if is_key_error(e):
+                self._reject_key(e)
+                return False
+            self.logger.warning(f"Model listesi alınamadı: {e}. Varsayılan model kullanılacak: {self.model}")
+            return True
+
+        self.logger.info(f"Kullanılabilir modeller: {available_models}")
+
+        # En iyi model eşleşmesini bul
+        if "gemini-pro" in available_models:
+            self.model = "gemini-pro"
+        elif "gemini-1.5-pro" in available_models:
+            self.model = "gemini-1.5-pro"
+        elif "gemini-1.5-flash" in available_models:
+            self.model = "gemini-1.5-flash"
+        else:
+            # Varsayılan olarak ilk gemini modelini kullan
+            for model_name in available_models:
+                if "gemini" in model_name:
+                    self.model = model_name
+                    break
+
+        self.clear_model_cache()
+        self.is_validated = True
+        self.validation_cache.store(self.api_key, self.model)
+        self.logger.info(f"Gemini API başarıyla yapılandırıldı, model: {self.model}")
+        return True
+
+    def _reject_key(self, error):
+        """Geçersiz anahtarı yapılandırmadan ve doğrulama kaydından kaldır"""
+        self.logger.error(f"API anahtarı geçerli değil: {error}")
+        self.is_configured = False
+        self.is_validated = False
+        self.validation_cache.forget(self.api_key)
     
     def get_prompt(self, prompt_key, replacements=None):
         """Belirtilen prompt'u getir ve değişkenleri doldur"""
-        if prompt_key not in self.prompts:
+        prompts = self.prompts
+        if prompt_key not in prompts:
             self.logger.error(f"Prompt bulunamadı: {prompt_key}")
             return f"Prompt bulunamadı: {prompt_key}"
             
-        prompt_text = self.prompts[prompt_key].get("text", "")
+        prompt_text = prompts[prompt_key].get("text", "")
         
         if replacements and prompt_text:
             for key, value in replacements.items():
@@ -125,41 +293,50 @@ class GeminiClient:
                 
         return prompt_text
     
+    def clear_model_cache(self):
+        """Önbellekteki model nesnelerini at (API anahtarı veya model değiştiğinde)"""
+        with self._models_lock:
+            self._models.clear()
+
+    def get_model(self, system_instruction=None, generation_config=None):
+        """
+        Model nesnesini önbellekten getir; yoksa oluştur.
+
+        Aynı model adı, üretim ayarları ve sistem talimatı için tek nesne kullanılır;
+        sistem talimatı modele doğrudan verilir.
+        """
+        generation_config = generation_config or GENERATION_CONFIG
+        key = (self.model, tuple(sorted(generation_config.items())), system_instruction)
+        with self._models_lock:
+            model = self._models.get(key)
+            if model is None:
+                options = {}
+                if system_instruction:
+                    # system_instruction parametresi google-generativeai 0.5.0 ile geldi
+                    options['system_instruction'] = system_instruction
+                model = genai.GenerativeModel(
+                    model_name=self.model,
+                    generation_config=generation_config,
+                    safety_settings=SAFETY_SETTINGS,
+                    **options
+                )
+                self._models[key] = model
+            return model
+
     def generate_content(self, prompt, system_instruction=None):
         """Gemini API'ye istek gönder"""
         if not self.is_configured:
             self.logger.error("API yapılandırılmamış, lütfen önce API anahtarını ayarlayın")
             return "API yapılandırılmamış, lütfen önce API anahtarı ekleyin."
         
+        # Anahtar ilk istekte doğrulanır (sonuç diskte saklanır)
+        if not self.validate():
+            return "API anahtarı geçerli değil, lütfen API anahtarınızı kontrol edin."
+        
         try:
-            generation_config = {
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "top_k": 40,
-                "max_output_tokens": 2048,
-            }
-            
-            # Safety settings
-            safety_settings = [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            ]
-            
-            # Model oluştur
-            model = genai.GenerativeModel(
-                model_name=self.model,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            )
-            
-            # Sistem talimatı varsa ekle
-            if system_instruction:
-                chat = model.start_chat(system_instruction=system_instruction)
-                response = chat.send_message(prompt)
-            else:
-                response = model.generate_content(prompt)
+            # Aynı ayarlar ve sistem talimatı için model her çağrıda yeniden oluşturulmaz
+            model = self.get_model(system_instruction)
+            response = model.generate_content(prompt)
             
             if response:
                 return response.text
@@ -167,5 +344,28 @@ class GeminiClient:
                 return "API'den geçerli bir yanıt alınamadı."
                 
         except Exception as e:
+            if is_key_error(e):
+                self._reject_key(e)
             self.logger.error(f"İçerik oluşturulurken hata: {str(e)}")
-            return f"Hata: {str(e)}"
\ No newline at end of file
+            return f"Hata: {str(e)}"
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Süreç genelinde paylaşılan GeminiClient'ı döndür.
+
+    İlk çağrıda istemci oluşturulur ve API anahtarı dosyadan yüklenir; sonraki çağrılar (farklı
+    iş parçacıklarından da) aynı yapılandırılmış istemciyi kullanır.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                client = GeminiClient()
+                client._load_api_key_from_file()
+                _client = client
+    return _client
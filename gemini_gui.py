@@ -145,7 +145,7 @@ class GeminiEmailGUI:
         try:
             # Arka planda API anahtarını test et
             def test_api_key():
-                is_valid = self.email_generator.set_api_key(api_key)
+                is_valid = self.email_generator.set_api_key(api_key, validate=True)
                 self.window.after(0, lambda: self.handle_api_test_result(api_key, is_valid))
             
             import threading
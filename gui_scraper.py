@@ -6,11 +6,8 @@ import os
 import sys
 import logging
 import time
-from company_scraper import (
-    find_website_via_google, 
-    scrape_company_website, 
-    clean_url
-)
+from parser_backend import available_backends, AUTO_BACKEND
+from scrape_pipeline import PipelineConfig, ScrapePipeline, DEFAULT_COMPANY_BUDGET
 from gemini_api import GeminiEmailGenerator
 
 # Tab içinde data grid görüntüleme sınıfı
@@ -523,6 +520,10 @@ class ScraperApp:
         self.stop_button = ttk.Button(self.control_buttons_frame, text="⏹️ Durdur", command=self.stop_scraping, state=tk.DISABLED)
         self.stop_button.pack(side=tk.LEFT, padx=5)
         
+        # Çalışma sırasında o ana kadarki sonuçları Excel'e aktar
+        self.export_button = ttk.Button(self.control_buttons_frame, text="💾 Ara Kayıt", command=self.export_progress, state=tk.DISABLED)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+        
         # Dosya seçme bölümü
         self.file_frame = ttk.LabelFrame(self.left_panel, text="Dosya Seçimi")
         self.file_frame.pack(fill='x', pady=10, padx=5)
@@ -541,13 +542,80 @@ class ScraperApp:
         self.settings_frame = ttk.LabelFrame(self.left_panel, text="Temel Ayarlar")
         self.settings_frame.pack(fill='x', pady=10, padx=5)
         
-        self.delay_label = ttk.Label(self.settings_frame, text="İstekler arası gecikme (saniye):")
+        self.delay_label = ttk.Label(self.settings_frame, text="Aynı siteye istekler arası gecikme (saniye):")
         self.delay_label.pack(fill='x', padx=5, pady=5)
         
         self.delay_var = tk.DoubleVar(value=2.0)
         self.delay_spinbox = ttk.Spinbox(self.settings_frame, from_=0.5, to=10.0, increment=0.5, textvariable=self.delay_var)
         self.delay_spinbox.pack(fill='x', padx=5, pady=5)
         
+        self.concurrency_label = ttk.Label(self.settings_frame, text="Eşzamanlı firma sayısı:")
+        self.concurrency_label.pack(fill='x', padx=5, pady=5)
+        
+        self.concurrency_var = tk.IntVar(value=16)
+        self.concurrency_spinbox = ttk.Spinbox(self.settings_frame, from_=1, to=128, increment=1, textvariable=self.concurrency_var)
+        self.concurrency_spinbox.pack(fill='x', padx=5, pady=5)
+        
+        self.per_host_label = ttk.Label(self.settings_frame, text="Site başına eşzamanlı istek:")
+        self.per_host_label.pack(fill='x', padx=5, pady=5)
+        
+        self.per_host_var = tk.IntVar(value=2)
+        self.per_host_spinbox = ttk.Spinbox(self.settings_frame, from_=1, to=8, increment=1, textvariable=self.per_host_var)
+        self.per_host_spinbox.pack(fill='x', padx=5, pady=5)
+        
+        self.budget_label = ttk.Label(self.settings_frame, text="Firma başına süre sınırı (saniye, 0: sınırsız):")
+        self.budget_label.pack(fill='x', padx=5, pady=5)
+        
+        self.budget_var = tk.DoubleVar(value=DEFAULT_COMPANY_BUDGET)
+        self.budget_spinbox = ttk.Spinbox(self.settings_frame, from_=0, to=600, increment=10, textvariable=self.budget_var)
+        self.budget_spinbox.pack(fill='x', padx=5, pady=5)
+        
+        # Eşzamanlı firma sayısı üst sınır olur; limit gecikme ve 429 oranına göre ayarlanır
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.adaptive_check = ttk.Checkbutton(
+            self.settings_frame, 
+            text="Uyarlanabilir eşzamanlılık (yavaşlama ve 429 yanıtlarında azalt)", 
+            variable=self.adaptive_var
+        )
+        self.adaptive_check.pack(fill='x', padx=5, pady=5)
+        
+        self.parser_label = ttk.Label(self.settings_frame, text="HTML ayrıştırıcı:")
+        self.parser_label.pack(fill='x', padx=5, pady=5)
+        
+        # 'auto' kurulu olan en hızlı ayrıştırıcıyı seçer
+        self.parser_var = tk.StringVar(value=AUTO_BACKEND)
+        self.parser_menu = ttk.Combobox(
+            self.settings_frame, 
+            textvariable=self.parser_var,
+            values=[AUTO_BACKEND] + available_backends(),
+            state="readonly"
+        )
+        self.parser_menu.pack(fill='x', padx=5, pady=5)
+        
+        self.cache_var = tk.BooleanVar(value=True)
+        self.cache_check = ttk.Checkbutton(
+            self.settings_frame, 
+            text="Önbelleği kullan (daha önce indirilen sayfaları diskten oku)", 
+            variable=self.cache_var
+        )
+        self.cache_check.pack(fill='x', padx=5, pady=5)
+        
+        self.debug_capture_var = tk.BooleanVar(value=False)
+        self.debug_capture_check = ttk.Checkbutton(
+            self.settings_frame, 
+            text="Hata ayıklama kaydı (arama sayfalarını arşivle)", 
+            variable=self.debug_capture_var
+        )
+        self.debug_capture_check.pack(fill='x', padx=5, pady=5)
+        
+        self.resume_var = tk.BooleanVar(value=True)
+        self.resume_check = ttk.Checkbutton(
+            self.settings_frame, 
+            text="Kaldığı yerden devam et (aynı ayarlarla tamamlanan satırları atla)", 
+            variable=self.resume_var
+        )
+        self.resume_check.pack(fill='x', padx=5, pady=5)
+        
         self.google_search_var = tk.BooleanVar(value=True)
         self.google_search_check = ttk.Checkbutton(
             self.settings_frame, 
@@ -675,7 +743,9 @@ class ScraperApp:
             ("İşlem Aşaması:", "process_stage_var", "-"),
             ("Kalan Firma:", "remaining_var", "-"),
             ("Son Bulunan:", "last_info_var", "-"),
-            ("Tahmini Süre:", "estimated_time_var", "-")
+            ("Tahmini Süre:", "estimated_time_var", "-"),
+            ("İşlem Hızı:", "speed_var", "-"),
+            ("Eşzamanlılık:", "concurrency_status_var", "-")
         ]
         
         # Status labels oluştur
@@ -769,6 +839,7 @@ class ScraperApp:
         # İş parçacığı kontrolü
         self.running = False
         self.thread = None
+        self.pipeline = None
         self.start_time = None
         self.last_processed_time = None
         
@@ -898,6 +969,7 @@ class ScraperApp:
         self.running = True
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
+        self.export_button.config(state=tk.NORMAL)
         
         # Durum değişkenlerini sıfırla
         self.process_stage_var.set("Başlatılıyor")
@@ -905,6 +977,8 @@ class ScraperApp:
         self.remaining_var.set("-")
         self.last_info_var.set("-")
         self.estimated_time_var.set("Hesaplanıyor...")
+        self.speed_var.set("-")
+        self.concurrency_status_var.set("-")
         self.progress_percent_var.set("0%")
         
         # Başlangıç zamanı
@@ -923,10 +997,27 @@ class ScraperApp:
         """Veri çekme işlemini durdur"""
         if messagebox.askyesno("Durdurma Onayı", "İşlemi durdurmak istediğinize emin misiniz?"):
             self.running = False
+            if self.pipeline:
+                self.pipeline.stop()
             self.status_var.set("Durduruluyor...")
             self.process_stage_var.set("İşlem durduruluyor")
             self.logger.info("İşlem kullanıcı tarafından durduruldu.")
     
+    def export_progress(self):
+        """O ana kadar tamamlanan satırları günlükten Excel dosyasına yaz"""
+        pipeline = self.pipeline
+        if pipeline is None or pipeline.journal is None:
+            return
+        
+        def export():
+            try:
+                applied = pipeline.export()
+                self.logger.info(f"Ara kayıt oluşturuldu ({applied} satır): {pipeline.output_file}")
+            except Exception as e:
+                self.logger.error(f"Ara kayıt oluşturulamadı: {str(e)}")
+        
+        threading.Thread(target=export, daemon=True).start()
+    
     def scrape_process(self):
         """Veri çekme işlemi ana süreci"""
         try:
@@ -934,158 +1025,66 @@ class ScraperApp:
             self.status_var.set("Excel dosyası okunuyor...")
             self.process_stage_var.set("Excel dosyası okunuyor")
             
-            # Excel dosyasını oku
+            # Arayüzdeki seçeneklerden tarama ayarlarını oluştur
+            column_mapping = {name: self.column_vars[name].get() for name in self.column_vars}
+            config = PipelineConfig(
+                self.file_path.get(),
+                columns=column_mapping,
+                fields=[name for name, var in self.column_checkboxes.items() if var.get()],
+                email_pattern=self.email_format.get(),
+                phone_patterns=[var.get() for var in self.phone_vars],
+                result_index=self.google_result_menu.current(),
+                search_enabled=self.google_search_var.get(),
+                concurrency=self.concurrency_var.get(),
+                per_host_limit=self.per_host_var.get(),
+                delay=self.delay_var.get(),
+                cache=self.cache_var.get(),
+                debug_capture=self.debug_capture_var.get(),
+                parser=self.parser_var.get(),
+                resume=self.resume_var.get(),
+                adaptive_concurrency=self.adaptive_var.get(),
+                company_budget=self.budget_var.get()
+            )
+            self.pipeline = ScrapePipeline(config, logger=self.logger)
+            output_file = config.output_file
+            
+            # Excel dosyasını oku ve işlenecek firmaları hazırla
             try:
-                df = pd.read_excel(self.file_path.get())
-                self.logger.info(f"Dosya başarıyla okundu: {len(df)} satır.")
+                jobs = self.pipeline.prepare()
+            except ValueError as e:
+                self.logger.error(str(e))
+                messagebox.showerror("Hata", str(e))
+                return
             except Exception as e:
                 self.logger.error(f"Excel dosyası okunamadı: {str(e)}")
                 messagebox.showerror("Hata", f"Excel dosyası okunamadı: {str(e)}")
-                self.reset_ui()
                 return
             
-            # Kullanıcının belirlediği sütun adlarını al
-            column_mapping = {name: self.column_vars[name].get() for name in self.column_vars}
-            
-            # Seçilen sütunlar ve kontrol
-            required_columns = [column_mapping['FirmaAdı'], column_mapping['WebSitesi']]
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                self.logger.error(f"Excel dosyasında gerekli sütunlar bulunamadı: {', '.join(missing_columns)}")
-                messagebox.showerror("Hata", f"Excel dosyasında gerekli sütunlar bulunamadı: {', '.join(missing_columns)}")
-                self.reset_ui()
-                return
-            
-            # İşlenecek sütunları belirle
-            process_columns = {}
-            for name, var_name in column_mapping.items():
-                # Gerekli sütunlar her zaman işlenir
-                if name in ['FirmaAdı', 'WebSitesi']:
-                    process_columns[name] = True
-                # Diğer sütunlar için checkbox kontrolü
-                elif name in self.column_checkboxes:
-                    process_columns[name] = self.column_checkboxes[name].get()
-                else:
-                    process_columns[name] = False
-            
-            # Format regex'lerini al
-            email_pattern = self.email_format.get()
-            phone_patterns = [var.get() for var in self.phone_vars if var.get().strip()]
-            
-            # Google araması için sonuç sırasını al
-            google_result_index = self.google_result_menu.current()
-            
-            # Gerekli sütunlar yoksa ekle
-            for original_name, excel_name in column_mapping.items():
-                if process_columns[original_name] and excel_name not in df.columns:
-                    df[excel_name] = None
-            
-            # Sonuç dosyası adını hazırla
-            output_file = os.path.splitext(self.file_path.get())[0] + "_updated.xlsx"
-            
-            total_rows = len(df)
-            processed_rows = 0
+            total_rows = len(jobs)
+            self.processed_rows = 0
             self.remaining_var.set(f"{total_rows}")
             
-            # Her firma için işlem yap
-            for idx, row in df.iterrows():
-                if not self.running:
-                    break
-                
-                # İşleme süresi hesapla
-                current_time = time.time()
-                if processed_rows > 0:
-                    time_per_company = (current_time - self.start_time) / processed_rows
-                    remaining_time = time_per_company * (total_rows - processed_rows)
-                    
-                    # Kalan süreyi formatlı göster
-                    if remaining_time < 60:
-                        time_str = f"{int(remaining_time)} saniye"
-                    elif remaining_time < 3600:
-                        time_str = f"{int(remaining_time / 60)} dakika {int(remaining_time % 60)} saniye"
-                    else:
-                        time_str = f"{int(remaining_time / 3600)} saat {int((remaining_time % 3600) / 60)} dakika"
-                    
-                    self.estimated_time_var.set(time_str)
-                    
-                    # İşlem hızını hesapla
-                    if current_time - self.last_processed_time > 0:
-                        speed = 1 / (current_time - self.last_processed_time)
-                        self.speed_var.set(f"{speed:.2f} firma/saniye") if hasattr(self, 'speed_var') else None
-                    
-                self.last_processed_time = current_time
-                    
-                # Sütun adlarını kullanıcının ayarladığı şekilde kullan
-                company_name = row[column_mapping['FirmaAdı']]
-                website = row[column_mapping['WebSitesi']]
-                
-                # Durumu güncelle
-                self.status_var.set(f"İşleniyor: {company_name}")
-                self.current_company_var.set(f"{company_name}")
-                self.remaining_var.set(f"{total_rows - processed_rows - 1}")
-                self.logger.info(f"İşleniyor: {company_name}")
-                
-                # Boş firma adlarını atla
-                if pd.isna(company_name) or not company_name.strip():
-                    self.logger.warning(f"Satır {idx+2}: Firma adı boş, atlanıyor.")
-                    continue
-                    
-                # Web sitesi yoksa arama yap
-                if (pd.isna(website) or not website.strip()) and self.google_search_var.get():
-                    self.process_stage_var.set("Google araması yapılıyor")
-                    self.logger.info(f"{company_name} için Google araması yapılıyor... ({google_result_index+1}. sonuç istenmiş)")
-                    website = find_website_via_google(company_name, result_index=google_result_index)
-                    df.at[idx, column_mapping['WebSitesi']] = website
-                    self.logger.info(f"Bulunan site: {website}")
-                    time.sleep(self.delay_var.get())  # Limit aşımını engelle
-                
-                # Web sitesinden bilgi çek
-                if website and website.strip():
-                    self.process_stage_var.set("Web sitesi taranıyor")
-                    self.logger.info(f"{company_name} için web sitesi taranıyor: {website}")
-                    
-                    # Kullanıcı tanımlı formatları ilet
-                    company_data = scrape_company_website(
-                        website, 
-                        email_pattern=email_pattern, 
-                        phone_patterns=phone_patterns
-                    )
-                    
-                    # DataFrame'i güncelle
-                    data_found = []
-                    for original_col, excel_col in column_mapping.items():
-                        if process_columns.get(original_col, False) and original_col in company_data and company_data[original_col]:
-                            df.at[idx, excel_col] = company_data[original_col]
-                            data_found.append(original_col)
-                    
-                    # Bulunan bilgileri logla
-                    if data_found:
-                        self.logger.info(f"Bulunan bilgiler: {', '.join(data_found)}")
-                        self.last_info_var.set(f"Bulunan: {', '.join(data_found)}")
-                    else:
-                        self.logger.info("Hiç veri bulunamadı")
-                        self.last_info_var.set("Hiç veri bulunamadı")
-                            
-                    # Düzenli kaydet
-                    if idx % 5 == 0:
-                        self.process_stage_var.set("İlerleme kaydediliyor")
-                        df.to_excel(output_file, index=False)
-                        self.logger.info(f"Ara ilerleme kaydedildi: {output_file}")
-                        
-                    time.sleep(self.delay_var.get())  # İstekler arası gecikme
-                else:
-                    self.logger.warning(f"{company_name} için web sitesi bulunamadı.")
+            def on_start(job):
+                self.status_var.set(f"İşleniyor: {job.company_name}")
+                self.current_company_var.set(f"{job.company_name}")
+            
+            def on_result(result, found):
+                if result.partial:
+                    self.last_info_var.set(f"Kısmi: {result.partial}")
+                elif result.website:
+                    self.last_info_var.set(f"Bulunan: {', '.join(found)}" if found else "Hiç veri bulunamadı")
                 
                 # İlerlemeyi güncelle
-                processed_rows += 1
-                progress = (processed_rows / total_rows) * 100
-                self.progress_var.set(progress)
-                self.progress_percent_var.set(f"%{progress:.1f}")
-                
-            # Son sonuçları kaydet
+                self.processed_rows += 1
+                self.update_progress(self.processed_rows, total_rows)
+            
+            # Firmaları eşzamanlı işle; sonunda Excel dosyası günlükten oluşturulur
+            self.process_stage_var.set("Firmalar taranıyor")
+            if not self.running:
+                self.pipeline.stop()
+            self.pipeline.run(on_start=on_start, on_result=on_result,
+                              on_limit_change=self.concurrency_status_var.set)
             self.process_stage_var.set("Sonuçlar kaydediliyor")
-            df.to_excel(output_file, index=False)
             
             # Toplam süreyi hesapla
             total_time = time.time() - self.start_time
@@ -1121,11 +1120,44 @@ class ScraperApp:
         finally:
             self.reset_ui()
     
+    def update_progress(self, processed_rows, total_rows):
+        """İlerleme çubuğunu, kalan firma sayısını ve tahmini süreyi güncelle"""
+        current_time = time.time()
+        progress = (processed_rows / total_rows) * 100 if total_rows else 100
+        self.progress_var.set(progress)
+        self.progress_percent_var.set(f"%{progress:.1f}")
+        self.remaining_var.set(f"{total_rows - processed_rows}")
+        
+        # Kalan süreyi tamamlanan firma başına ortalama süreden hesapla
+        elapsed = current_time - self.start_time
+        if processed_rows > 0:
+            remaining_time = elapsed / processed_rows * (total_rows - processed_rows)
+            
+            # Kalan süreyi formatlı göster
+            if remaining_time < 60:
+                time_str = f"{int(remaining_time)} saniye"
+            elif remaining_time < 3600:
+                time_str = f"{int(remaining_time / 60)} dakika {int(remaining_time % 60)} saniye"
+            else:
+                time_str = f"{int(remaining_time / 3600)} saat {int((remaining_time % 3600) / 60)} dakika"
+            
+            self.estimated_time_var.set(time_str)
+            
+            # İşlem hızını hesapla
+            if elapsed > 0:
+                speed = processed_rows / elapsed
+                self.speed_var.set(f"{speed:.2f} firma/saniye")
+        
+        self.last_processed_time = current_time
+    
     def reset_ui(self):
         """Arayüzü sıfırla"""
         self.running = False
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
+        self.export_button.config(state=tk.DISABLED)
+        if self.pipeline is not None:
+            self.pipeline.close()
     
     def setup_logging(self):
         # Create custom handler to redirect logs to the text widget
@@ -0,0 +1,184 @@
+import io
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+import logging
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Varsayılan önbellek ayarları
+DEFAULT_CACHE_DIR = "http_cache"
+DEFAULT_CACHE_TTL = 7 * 24 * 3600          # Bir yanıt bu süre boyunca sunucuya sorulmadan kullanılır
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Diskte tutulacak en fazla (sıkıştırılmış) veri
+
+# Önbelleğe yazılmayacak yanıt başlıkları
+_SKIPPED_HEADERS = {'set-cookie', 'content-encoding', 'transfer-encoding', 'content-length', 'connection'}
+
+
+class CacheEntry:
+    """Önbellekteki tek bir yanıt"""
+
+    def __init__(self, url, status_code, headers, body, encoding, etag, last_modified, fetched_at):
+        # Yönlendirmelerden sonraki son adres
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.encoding = encoding
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self):
+        """Koşullu istek (revalidation) başlıklarını döndür"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self):
+        """Girdiyi requests.Response nesnesine dönüştür"""
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        # Gövde zaten bellekte: close() ve iter_content() ağ bağlantısı aramaz
+        response._content_consumed = True
+        response.raw = io.BytesIO(self.body)
+        response.encoding = self.encoding
+        response.url = self.url
+        response.from_cache = True
+        return response
+
+
+class HttpCache:
+    """
+    Disk üzerinde tutulan HTTP yanıt önbelleği.
+
+    Yanıtlar SQLite veritabanında sıkıştırılmış olarak saklanır. TTL süresi dolan girdiler
+    ETag / Last-Modified ile sunucuya doğrulatılır; toplam boyut sınırı aşıldığında
+    en uzun süredir kullanılmayan girdiler silinir (LRU).
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger("HttpCache")
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "responses.sqlite"),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                body BLOB,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                last_access REAL,
+                size INTEGER
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        """URL için önbellekteki girdiyi döndür (yoksa None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT final_url, status_code, headers, body, encoding, etag, last_modified, fetched_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+
+        final_url, status_code, headers, body, encoding, etag, last_modified, fetched_at = row
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            self.logger.warning(f"Bozuk önbellek girdisi siliniyor: {url} ({e})")
+            self.delete(url)
+            return None
+        return CacheEntry(final_url or url, status_code, json.loads(headers), body, encoding, etag, last_modified, fetched_at)
+
+    def store(self, url, response):
+        """Başarılı bir yanıtı önbelleğe yaz"""
+        if response.status_code != 200:
+            return
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control:
+            return
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _SKIPPED_HEADERS}
+        body = zlib.compress(response.content, 3)
+        now = time.time()
+
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, final_url, status_code, headers, body, encoding, etag, last_modified, fetched_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.url, response.status_code, json.dumps(headers), body, response.encoding,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now, len(body))
+            )
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, url):
+        """304 yanıtından sonra girdinin süresini yenile"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url)
+            )
+
+    def delete(self, url):
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._total_bytes -= row[0]
+
+    def _evict(self):
+        """Boyut sınırının %90'ının altına inene kadar en eski girdileri sil (kilit tutulurken çağrılır)"""
+        target = self.max_bytes * 0.9
+        removed = 0
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY last_access ASC").fetchall()
+        for url, size in rows:
+            if self._total_bytes <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._total_bytes -= size
+            removed += 1
+        self.logger.info(f"Önbellekten {removed} eski yanıt silindi, toplam boyut: {self._total_bytes} bayt")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,274 @@
+import time
+import threading
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from politeness import get_scheduler
+from deadline import clamp_timeout, sleep
+from http_cache import HttpCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_TTL, DEFAULT_CACHE_MAX_BYTES
+
+# Varsayılan oturum ayarları
+DEFAULT_SESSION_SETTINGS = {
+    'pool_connections': 64,     # Bağlantı havuzu tutulacak farklı host sayısı
+    'pool_maxsize': 8,          # Host başına açık tutulacak (keep-alive) bağlantı sayısı
+    'max_retries': 2,           # Bağlantı / geçici sunucu hataları için tekrar sayısı
+    'backoff_factor': 0.5,      # Tekrarlar arası üstel bekleme katsayısı
+    # 429 tekrar denenmez: Retry-After beklemesi süre bütçesini ve durdurmayı aşar, hız limiti
+    # zamanlayıcı ve uyarlanabilir eşzamanlılık tarafından yönetilir
+    'status_forcelist': (500, 502, 503, 504),
+    'timeout': 20,              # İstekte zaman aşımı verilmezse kullanılacak süre (saniye)
+}
+
+_settings = dict(DEFAULT_SESSION_SETTINGS)
+_session = None
+_session_lock = threading.Lock()
+
+_cache = None
+_cache_enabled = True
+_cache_lock = threading.Lock()
+
+_observers = []
+
+logger = logging.getLogger("HttpClient")
+
+try:
+    from urllib3.exceptions import NameResolutionError
+    _NAME_RESOLUTION_ERRORS = (NameResolutionError,)
+except ImportError:
+    # urllib3 < 2: DNS hataları NewConnectionError olarak gelir
+    _NAME_RESOLUTION_ERRORS = ()
+
+
+def _build_session(settings):
+    """
+    Ayarlara göre havuzlu bir requests oturumu oluştur.
+
+    Tekrar denemeler urllib3'te değil http_get içinde yapılır; böylece her deneme süre bütçesiyle
+    sınırlanır ve beklemeler durdurulunca kesilir.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=settings['pool_connections'],
+        pool_maxsize=settings['pool_maxsize'],
+        max_retries=0
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def configure_session(**settings):
+    """
+    Paylaşılan HTTP oturumunu yeniden yapılandır.
+
+    Args:
+        pool_connections: Havuzu tutulacak host sayısı
+        pool_maxsize: Host başına keep-alive bağlantı sayısı
+        max_retries: Tekrar deneme sayısı
+        backoff_factor: Tekrarlar arası bekleme katsayısı
+        status_forcelist: Tekrar denenecek HTTP durum kodları
+        timeout: Varsayılan zaman aşımı (saniye)
+    """
+    global _session
+    unknown = set(settings) - set(DEFAULT_SESSION_SETTINGS)
+    if unknown:
+        raise ValueError(f"Bilinmeyen oturum ayarı: {', '.join(sorted(unknown))}")
+
+    with _session_lock:
+        new_settings = dict(_settings)
+        new_settings.update(settings)
+        if new_settings == _settings and _session is not None:
+            return
+        _settings.update(new_settings)
+        old_session = _session
+        _session = _build_session(_settings)
+
+    if old_session is not None:
+        old_session.close()
+    logger.info(f"HTTP oturumu yapılandırıldı: {_settings}")
+
+
+def get_session():
+    """Tüm modüllerin kullandığı paylaşılan oturumu döndür"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(_settings)
+    return _session
+
+
+def configure_cache(enabled=True, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+    """
+    Disk önbelleğini yapılandır.
+
+    Args:
+        enabled: False ise tüm istekler ağa gider
+        cache_dir: Önbellek klasörü
+        ttl: Yanıtın doğrulama yapılmadan kullanılacağı süre (saniye)
+        max_bytes: Önbelleğin diskte kaplayabileceği en fazla boyut
+    """
+    global _cache, _cache_enabled
+    with _cache_lock:
+        _cache_enabled = enabled
+        old_cache, _cache = _cache, None
+        if enabled:
+            _cache = HttpCache(cache_dir, ttl=ttl, max_bytes=max_bytes)
+    if old_cache is not None:
+        old_cache.close()
+
+
+def get_cache():
+    """Paylaşılan önbelleği döndür (kapalıysa None)"""
+    global _cache
+    if _cache is None and _cache_enabled:
+        with _cache_lock:
+            if _cache is None and _cache_enabled:
+                try:
+                    _cache = HttpCache()
+                except Exception as e:
+                    logger.error(f"HTTP önbelleği açılamadı, önbelleksiz devam ediliyor: {e}")
+                    return None
+    return _cache
+
+
+def cache_response(url, response):
+    """
+    Gövdesi okunmuş bir yanıtı istenen URL anahtarıyla önbelleğe yaz.
+
+    stream=True ile alınan yanıtlar http_get içinde önbelleğe yazılamaz; gövdeyi okuyan
+    çağıran taraf bu fonksiyonu kullanır.
+    """
+    cache = get_cache()
+    if cache is not None and not getattr(response, 'from_cache', False):
+        try:
+            cache.store(url, response)
+        except Exception as e:
+            logger.warning(f"Yanıt önbelleğe yazılamadı: {e}")
+
+
+def add_response_observer(observer):
+    """
+    Ağa giden her isteğin sonucunu bildiren fonksiyon ekle: observer(url, latency, status, error).
+
+    Tekrar denenen isteklerde her deneme ayrı bildirilir. latency nezaket beklemesi ve tekrarlar arası
+    bekleme hariç deneme süresidir (saniye); deneme hata verdiyse status None, error ise istisnadır.
+    Önbellekten dönen yanıtlar bildirilmez.
+    """
+    _observers.append(observer)
+
+
+def remove_response_observer(observer):
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def _notify(url, latency, status, error=None):
+    for observer in list(_observers):
+        try:
+            observer(url, latency, status, error)
+        except Exception as e:
+            logger.warning(f"Yanıt gözlemcisi hata verdi: {e}")
+
+
+def _retryable(error):
+    """
+    Yalnızca bağlantı kurulamayan istekler tekrar denenir.
+
+    Okuma zaman aşımı (sunucu yavaş / yanıt vermiyor), SSL ve DNS hataları tekrar denenmez.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or isinstance(error, requests.exceptions.SSLError):
+        return False
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError) and not isinstance(reason, _NAME_RESOLUTION_ERRORS)
+
+
+def _send(url, headers, timeout, kwargs):
+    """
+    İsteği gönder; bağlantı kurulamadığında ve status_forcelist yanıtlarında tekrar dene.
+
+    Tüm denemeler tek bir zaman aşımını paylaşır: tekrarlar timeout süresini uzatmaz. Her denemeden
+    önce zaman aşımı firmanın kalan süresiyle de sınırlanır; denemeler arası üstel bekleme süre
+    bütçesini aşmaz ve durdurulunca kesilir.
+    """
+    attempts = _settings['max_retries'] + 1
+    expires = time.monotonic() + timeout
+    for attempt in range(attempts):
+        attempt_timeout = clamp_timeout(max(0.0, expires - time.monotonic()), url)
+        started = time.monotonic()
+        try:
+            response = get_session().get(url, headers=headers, timeout=attempt_timeout, **kwargs)
+        except Exception as e:
+            # Gözlemciler her denemeyi ayrı görür (tekrarlar arası bekleme gecikmeye eklenmez)
+            if _observers:
+                _notify(url, time.monotonic() - started, None, e)
+            if not _retryable(e) or not _can_retry(attempt, attempts, expires):
+                raise
+            logger.info(f"İstek tekrar denenecek ({attempt + 1}/{attempts - 1}): {url}: {e}")
+        else:
+            if _observers:
+                _notify(url, time.monotonic() - started, response.status_code)
+            if (response.status_code not in _settings['status_forcelist']
+                    or not _can_retry(attempt, attempts, expires)):
+                return response
+            logger.info(f"İstek tekrar denenecek ({attempt + 1}/{attempts - 1}): {url}: HTTP {response.status_code}")
+            response.close()
+        sleep(_backoff(attempt), url)
+
+
+def _backoff(attempt):
+    return _settings['backoff_factor'] * 2 ** attempt
+
+
+def _can_retry(attempt, attempts, expires):
+    """Deneme hakkı ve bekleme sonrası ortak zaman aşımından kalan süre var mı"""
+    return attempt < attempts - 1 and expires - time.monotonic() > _backoff(attempt)
+
+
+def http_get(url, headers=None, timeout=None, polite=True, use_cache=True, **kwargs):
+    """
+    Paylaşılan oturum üzerinden GET isteği gönder.
+
+    polite=True iken istek, hedef host için zamanlayıcının izin verdiği ana kadar bekletilir.
+    use_cache=True iken taze önbellek girdisi ağa çıkmadan döndürülür; süresi dolmuş girdiler
+    ETag / Last-Modified ile doğrulanır ve 304 yanıtında önbellekteki gövde kullanılır.
+    Geçerli bir firma süre bütçesi varsa (deadline.py) zaman aşımı kalan süreyle sınırlanır,
+    süre dolduysa istek gönderilmeden DeadlineExceeded verilir. Çalıştırma durdurulduğunda host
+    beklemesi hemen kesilir ve yeni istek gönderilmeden Cancelled verilir.
+    """
+    if timeout is None:
+        timeout = _settings['timeout']
+
+    cache = get_cache() if use_cache else None
+    entry = cache.get(url) if cache is not None else None
+    if entry is not None:
+        if entry.is_fresh(cache.ttl):
+            return entry.to_response()
+        headers = dict(headers or {})
+        headers.update(entry.validators())
+
+    if polite:
+        clamp_timeout(timeout, url)
+        get_scheduler().wait(url, sleep=lambda delay: sleep(delay, url))
+    response = _send(url, headers, timeout, kwargs)
+
+    if entry is not None and response.status_code == 304:
+        cache.refresh(url)
+        response.close()
+        return entry.to_response()
+
+    if cache is not None and not kwargs.get('stream'):
+        cache_response(url, response)
+    return response
+
+
+def close_session():
+    """Açık bağlantıları kapat"""
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
@@ -0,0 +1,365 @@
+import re
+import json
+import bisect
+import logging
+from bs4 import NavigableString, CData, Tag
+from parser_backend import make_soup, get_parser, LXML_AVAILABLE
+
+if LXML_AVAILABLE:
+    from lxml import etree
+
+# İçeriği metne dahil edilmeyen etiketler (BeautifulSoup get_text() ile aynı)
+_SKIPPED_TAGS = {'script', 'style', 'template'}
+
+# Basit CSS seçicisi parçaları: #id, .sınıf, [öznitelik="değer"], :contains("metin")
+_SELECTOR_PART_RE = re.compile(r'#([\w-]+)|\.([\w-]+)|\[([\w-]+)="([^"]*)"\]|:(?:-soup-)?contains\("([^"]*)"\)')
+_SELECTOR_TAG_RE = re.compile(r'^([\w-]+)')
+
+
+class Element:
+    """Belgedeki bir HTML etiketinin değişmez özeti"""
+
+    __slots__ = ('index', 'tag', 'id', 'classes', 'attrs', 'parent', 'children', 'start', 'end', 'last')
+
+    def __init__(self, index, tag, attrs, parent, start):
+        self.index = index
+        self.tag = tag
+        self.attrs = attrs
+        self.id = attrs.get('id')
+        classes = attrs.get('class') or ()
+        self.classes = tuple(classes.split() if isinstance(classes, str) else classes)
+        self.parent = parent            # Üst etiketin indeksi (-1: kök)
+        self.children = []              # Alt etiketlerin indeksleri
+        self.start = start              # Metin düğümü aralığı [start, end)
+        self.end = start
+        self.last = index               # Son alt etiketin indeksi (alt ağaç [index, last])
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+
+class _CompoundSelector:
+    """Tek bir basit seçici (ör. 'div.footer:contains("Adres")')"""
+
+    def __init__(self, text):
+        match = _SELECTOR_TAG_RE.match(text)
+        self.tag = match.group(1) if match else None
+        self.ids = []
+        self.classes = []
+        self.attrs = []
+        self.contains = []
+        for part in _SELECTOR_PART_RE.finditer(text):
+            element_id, class_name, attr, value, contains = part.groups()
+            if element_id:
+                self.ids.append(element_id)
+            elif class_name:
+                self.classes.append(class_name)
+            elif attr:
+                self.attrs.append((attr, value))
+            elif contains is not None:
+                self.contains.append(contains)
+
+    def matches(self, doc, element):
+        if self.tag and element.tag != self.tag:
+            return False
+        if any(element.id != element_id for element_id in self.ids):
+            return False
+        if any(class_name not in element.classes for class_name in self.classes):
+            return False
+        if any(element.get(attr) != value for attr, value in self.attrs):
+            return False
+        return all(doc.contains_text(element, keyword) for keyword in self.contains)
+
+
+class PageDocument:
+    """
+    Bir HTML belgesinin tek geçişte çıkarılan, değişmez özeti.
+
+    Ağaç bir kez gezilir; metin düğümleri, etiketler, bağlantılar, meta etiketleri,
+    başlık ve JSON-LD blokları toplanır. Çıkarıcılar ağacı yeniden gezmek ya da
+    değiştirmek yerine bu özeti kullanır.
+    """
+
+    def __init__(self, root, url=None):
+        self.url = url
+        self.elements = []
+        self.strings = []           # Belge sırasıyla ham metin düğümleri
+        self.string_parents = []    # Her metin düğümünü içeren etiketin indeksi
+        self.links = []             # (href, metin) çiftleri
+        self.meta = {}              # name/property -> content
+        self.json_ld = []           # Ayrıştırılmış application/ld+json blokları
+        self.title = ""
+        self._walk(root)
+        self.text = ''.join(self.strings)
+        # Metin düğümleri arasına satır sonu konur; e-posta/telefon eşleşmeleri komşu etiketlere taşmaz
+        self.scan_text = '\n'.join(self.strings)
+        self._stripped = [s.strip() for s in self.strings]
+
+        # Sorgu sırasında bir kez oluşturulan dizinler
+        self._offsets = None            # Her metin düğümünün self.text içindeki başlangıcı
+        self._keyword_index = {}        # anahtar kelime -> bu metni içeren etiket indeksleri
+        self._pattern_index = {}        # desen -> eşleşen metin düğümü indeksleri (sıralı)
+        self._tag_index = None          # etiket adı / .sınıf / #id -> etiketler (belge sırasıyla)
+
+    @classmethod
+    def from_html(cls, html, url=None, backend=None):
+        """
+        HTML metnini ayrıştırıp belge oluştur.
+
+        lxml seçiliyse ağaç BeautifulSoup nesnesi kurulmadan doğrudan lxml üzerinden gezilir;
+        lxml belgeyi ayrıştıramazsa html.parser ile yeniden denenir.
+        """
+        backend = backend or get_parser()
+        if backend == 'lxml' and LXML_AVAILABLE:
+            try:
+                root = etree.fromstring(html, etree.HTMLParser())
+            except (etree.LxmlError, ValueError) as e:
+                logging.debug(f"lxml ayrıştıramadı, html.parser kullanılıyor: {e}")
+                root = None
+            if root is not None:
+                return cls(root, url)
+            backend = 'html.parser'
+        return cls(make_soup(html, backend), url)
+
+    def _walk(self, root):
+        """Ağacı özyineleme olmadan tek seferde gez"""
+        if isinstance(root, Tag):
+            contents, node_text = _soup_contents, _soup_text
+            top = contents(root)
+        else:
+            contents, node_text = _lxml_contents, _lxml_text
+            top = iter([(root.tag, root.attrib, root)])
+
+        stack = [(-1, top)]
+        while stack:
+            parent_index, children = stack[-1]
+            name, value, node = next(children, (None, None, None))
+
+            if node is None and value is None:
+                stack.pop()
+                if parent_index >= 0:
+                    self._close_element(self.elements[parent_index])
+                continue
+
+            if name is None:
+                # Metin düğümü
+                self.strings.append(value)
+                self.string_parents.append(parent_index)
+                continue
+
+            if name in _SKIPPED_TAGS:
+                if name == 'script' and (value.get('type') or '').lower() == 'application/ld+json':
+                    self._add_json_ld(node_text(node))
+                continue
+            element = Element(len(self.elements), name, dict(value), parent_index, len(self.strings))
+            self.elements.append(element)
+            if parent_index >= 0:
+                self.elements[parent_index].children.append(element.index)
+            if name == 'meta':
+                self._add_meta(element)
+            stack.append((element.index, contents(node)))
+
+    def _close_element(self, element):
+        element.end = len(self.strings)
+        element.last = len(self.elements) - 1
+        if element.tag == 'a' and element.get('href'):
+            text = ''.join(s.strip() for s in self.strings[element.start:element.end])
+            self.links.append((element.get('href'), text))
+        elif element.tag == 'title' and not self.title:
+            self.title = ''.join(self.strings[element.start:element.end])
+
+    def _add_meta(self, element):
+        key = element.get('name') or element.get('property') or element.get('itemprop')
+        content = element.get('content')
+        if key and content is not None and key.lower() not in self.meta:
+            self.meta[key.lower()] = content
+
+    def _add_json_ld(self, text):
+        try:
+            self.json_ld.append(json.loads(text))
+        except (ValueError, TypeError) as e:
+            logging.debug(f"JSON-LD bloğu ayrıştırılamadı: {e}")
+
+    # --- Sorgular ---
+
+    def element_text(self, element, strip=True, separator=''):
+        """Etiketin metni (strip=True: get_text(strip=True) ile aynı)"""
+        source = self._stripped if strip else self.strings
+        if separator:
+            return separator.join(s for s in source[element.start:element.end] if s)
+        return ''.join(source[element.start:element.end])
+
+    def element_text_excluding(self, element, excluded):
+        """Etiketin metni; excluded(alt_etiket) True dönen alt ağaçlar hariç tutulur"""
+        parts = []
+        position = element.start
+        index = element.index + 1
+        while index <= element.last:
+            child = self.elements[index]
+            if excluded(child):
+                parts.extend(self._stripped[position:child.start])
+                position = child.end
+                index = child.last + 1
+            else:
+                index += 1
+        parts.extend(self._stripped[position:element.end])
+        return ''.join(parts)
+
+    def contains_text(self, element, keyword):
+        """Etiketin (alt etiketler dahil) metni keyword içeriyor mu"""
+        return element.index in self.elements_containing(keyword)
+
+    def elements_containing(self, keyword):
+        """
+        Metni keyword içeren tüm etiketlerin indekslerini döndür (:contains ile aynı anlam).
+
+        Anahtar kelime tüm belge metninde bir kez aranır; her geçişin kapsadığı metin düğümlerinden
+        yukarı doğru çıkılarak bu düğümlerin hepsini içeren etiketler işaretlenir. Sonuç önbelleğe
+        alındığından her etiketin metnini ayrı ayrı taramak gerekmez.
+        """
+        found = self._keyword_index.get(keyword)
+        if found is not None:
+            return found
+        if self._offsets is None:
+            self._offsets = []
+            position = 0
+            for string in self.strings:
+                self._offsets.append(position)
+                position += len(string)
+
+        found = set()
+        position = self.text.find(keyword) if keyword else -1
+        while position >= 0:
+            first = bisect.bisect_right(self._offsets, position) - 1
+            last = bisect.bisect_right(self._offsets, position + len(keyword) - 1) - 1
+            index = self.string_parents[first]
+            # Geçişin son düğümünü de kapsayan ilk üst etiketi bul; ondan yukarısı da kapsar
+            while index >= 0 and self.elements[index].end <= last:
+                index = self.elements[index].parent
+            while index >= 0 and index not in found:
+                found.add(index)
+                index = self.elements[index].parent
+            position = self.text.find(keyword, position + 1)
+
+        found = frozenset(found)
+        self._keyword_index[keyword] = found
+        return found
+
+    def strings_matching(self, pattern):
+        """Derlenmiş desenle eşleşen metin düğümlerinin indekslerini (sıralı) döndür"""
+        found = self._pattern_index.get(pattern)
+        if found is None:
+            found = [i for i, string in enumerate(self.strings) if pattern.search(string)]
+            self._pattern_index[pattern] = found
+        return found
+
+    def strings_matching_in(self, element, pattern):
+        """Etiketin içindeki, desenle eşleşen metin düğümlerinin indeksleri"""
+        found = self.strings_matching(pattern)
+        return found[bisect.bisect_left(found, element.start):bisect.bisect_left(found, element.end)]
+
+    def string_parent(self, string_index):
+        """Metin düğümünü içeren etiketi döndür (kökteyse None)"""
+        parent = self.string_parents[string_index]
+        return self.elements[parent] if parent >= 0 else None
+
+    def next_siblings(self, element):
+        """Etiketten sonra gelen kardeş etiketler"""
+        if element.parent < 0:
+            siblings = [e for e in self.elements if e.parent < 0]
+        else:
+            siblings = [self.elements[i] for i in self.elements[element.parent].children]
+        return [e for e in siblings if e.index > element.index]
+
+    def _indexed(self, key):
+        """Etiket adı, '.sınıf' veya '#id' anahtarıyla eşleşen etiketler"""
+        if self._tag_index is None:
+            index = {}
+            for element in self.elements:
+                index.setdefault(element.tag, []).append(element)
+                for class_name in element.classes:
+                    index.setdefault('.' + class_name, []).append(element)
+                if element.id:
+                    index.setdefault('#' + element.id, []).append(element)
+            self._tag_index = index
+        return self._tag_index.get(key, [])
+
+    def find_all(self, tag):
+        return self._indexed(tag)
+
+    def select(self, selector):
+        """
+        Basit CSS seçicilerini belge sırasıyla uygula.
+
+        Desteklenen: etiket, #id, .sınıf, [öznitelik="değer"], :contains("metin"),
+        virgülle ayrılmış listeler ve boşlukla yazılan soy (descendant) ilişkisi.
+        """
+        chains = [[_CompoundSelector(part) for part in group.split()] for group in selector.split(',')]
+        candidates = set()
+        for chain in chains:
+            candidates.update(e.index for e in self._candidates(chain[-1]) if self._matches_chain(e, chain))
+        return [self.elements[index] for index in sorted(candidates)]
+
+    def _candidates(self, compound):
+        """Seçicinin eşleşebileceği etiketleri dizinlerden daralt"""
+        if compound.contains:
+            return [self.elements[index] for index in sorted(self.elements_containing(compound.contains[0]))]
+        if compound.ids:
+            return self._indexed('#' + compound.ids[0])
+        if compound.classes:
+            return self._indexed('.' + compound.classes[0])
+        if compound.tag:
+            return self._indexed(compound.tag)
+        return self.elements
+
+    def _matches_chain(self, element, chain):
+        if not chain[-1].matches(self, element):
+            return False
+        # Kalan seçiciler sırayla üst etiketlerde aranır
+        ancestor = element.parent
+        for compound in reversed(chain[:-1]):
+            while ancestor >= 0 and not compound.matches(self, self.elements[ancestor]):
+                ancestor = self.elements[ancestor].parent
+            if ancestor < 0:
+                return False
+            ancestor = self.elements[ancestor].parent
+        return True
+
+
+# Ağaç gezici için düğüm kaynakları: her biri (etiket, öznitelikler, düğüm) veya (None, metin, None) üretir
+
+def _soup_contents(node):
+    for child in node.contents:
+        if isinstance(child, Tag):
+            yield child.name, child.attrs, child
+        elif type(child) in (NavigableString, CData):
+            # Yorumlar, doctype vb. get_text() ile aynı şekilde atlanır
+            yield None, str(child), None
+
+
+def _soup_text(node):
+    return node.get_text()
+
+
+def _lxml_contents(node):
+    if node.text:
+        yield None, node.text, None
+    for child in node:
+        # Yorum ve işlem talimatlarının etiketi str değildir; yalnızca ardından gelen metin alınır
+        if isinstance(child.tag, str):
+            yield child.tag, child.attrib, child
+        if child.tail:
+            yield None, child.tail, None
+
+
+def _lxml_text(node):
+    return node.text or ''
+
+
+def as_document(page, url=None):
+    """BeautifulSoup/lxml ağacı, HTML metni veya PageDocument'ı PageDocument'a çevir"""
+    if isinstance(page, PageDocument):
+        return page
+    if isinstance(page, (str, bytes)):
+        return PageDocument.from_html(page, url)
+    return PageDocument(page, url)
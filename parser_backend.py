@@ -0,0 +1,55 @@
+import logging
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.etree  # noqa: F401  (C tabanlı ayrıştırıcı, kurulu değilse html.parser kullanılır)
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Hızlıdan yavaşa doğru desteklenen ayrıştırıcılar
+PARSER_BACKENDS = ('lxml', 'html.parser')
+AUTO_BACKEND = 'auto'
+
+logger = logging.getLogger("ParserBackend")
+
+
+def available_backends():
+    """Bu ortamda kullanılabilen ayrıştırıcıları hız sırasıyla döndür"""
+    return [name for name in PARSER_BACKENDS if name != 'lxml' or LXML_AVAILABLE]
+
+
+def _resolve(backend):
+    if backend in (None, AUTO_BACKEND):
+        return available_backends()[0]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Bilinmeyen HTML ayrıştırıcı: {backend}")
+    if backend not in available_backends():
+        logger.warning(f"{backend} kurulu değil, html.parser kullanılacak")
+        return 'html.parser'
+    return backend
+
+
+_backend = _resolve(AUTO_BACKEND)
+
+
+def configure_parser(backend=AUTO_BACKEND):
+    """
+    Kullanılacak HTML ayrıştırıcısını seç.
+
+    'auto' kurulu olan en hızlı ayrıştırıcıyı (lxml) seçer; lxml yoksa html.parser'a düşülür.
+    Seçilen ayrıştırıcının adını döndürür.
+    """
+    global _backend
+    _backend = _resolve(backend)
+    return _backend
+
+
+def get_parser():
+    """Etkin ayrıştırıcının adını döndür"""
+    return _backend
+
+
+def make_soup(markup, backend=None):
+    """Etkin (veya verilen) ayrıştırıcıyla BeautifulSoup nesnesi oluştur"""
+    return BeautifulSoup(markup, _resolve(backend) if backend else _backend)
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+# Arama motoru host'ları; bunlar için ayrı (daha sıkı) aralık uygulanır
+SEARCH_ENGINE_HOSTS = {'bing.com', 'google.com', 'duckduckgo.com'}
+
+# Varsayılan aralıklar (saniye)
+DEFAULT_SITE_INTERVAL = 2.0
+DEFAULT_SEARCH_INTERVAL = 2.0
+
+# Bir firma ziyaretinde (ana sayfa + iletişim sayfaları) beklemeden gidebilecek istek sayısı
+DEFAULT_SITE_BURST = 5
+
+
+def politeness_key(url):
+    """URL veya host için zamanlayıcı anahtarını döndür (www. öneki yok sayılır)"""
+    if not url:
+        return ""
+    host = urlparse(url).netloc if '//' in url else url
+    host = host.lower().split('@')[-1].split(':')[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    return host
+
+
+class PolitenessScheduler:
+    """
+    Host başına istek aralığını düzenleyen zamanlayıcı.
+
+    Her host için bir jeton kovası tutulur: kova `burst` kadar isteğin arka arkaya
+    gitmesine izin verir, sonrasında istekler `interval` saniyede bir yapılır.
+    Farklı host'lara giden istekler birbirini hiç bekletmez.
+    """
+
+    def __init__(self, site_interval=DEFAULT_SITE_INTERVAL, search_interval=DEFAULT_SEARCH_INTERVAL,
+                 site_burst=DEFAULT_SITE_BURST):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self.site_interval = site_interval
+        self.search_interval = search_interval
+        self.site_burst = site_burst
+
+    def configure(self, site_interval=None, search_interval=None, site_burst=None):
+        """Aralıkları güncelle"""
+        with self._lock:
+            if site_interval is not None:
+                self.site_interval = max(0.0, float(site_interval))
+            if search_interval is not None:
+                self.search_interval = max(0.0, float(search_interval))
+            if site_burst is not None:
+                self.site_burst = max(1, int(site_burst))
+
+    def _limits(self, key):
+        """Anahtar için (aralık, kova boyutu) döndür"""
+        if key in SEARCH_ENGINE_HOSTS:
+            # Arama motorlarında ani yığılma olmasın
+            return self.search_interval, 1
+        return self.site_interval, self.site_burst
+
+    def reserve(self, url):
+        """
+        Host için bir istek hakkı ayır.
+
+        Returns:
+            İstek gönderilmeden önce beklenmesi gereken süre (saniye)
+        """
+        key = politeness_key(url)
+        now = time.monotonic()
+        with self._lock:
+            interval, burst = self._limits(key)
+            if interval <= 0:
+                return 0.0
+
+            tokens, last = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) / interval) - 1
+            self._buckets[key] = (tokens, now)
+
+        # Jeton negatifse sıradaki boş zamana kadar beklenir
+        return -tokens * interval if tokens < 0 else 0.0
+
+    def wait(self, url, sleep=time.sleep):
+        """Gerekirse bekleyerek host için istek hakkı al (sleep: kesilebilir bekleme fonksiyonu)"""
+        delay = self.reserve(url)
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+    async def wait_async(self, url):
+        """wait() ile aynı, asyncio olay döngüsünü bloklamadan bekler"""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+_scheduler = PolitenessScheduler()
+
+
+def get_scheduler():
+    """Tüm modüllerin paylaştığı zamanlayıcıyı döndür"""
+    return _scheduler
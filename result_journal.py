@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import threading
+import logging
+
+DEFAULT_SYNC_INTERVAL = 1.0   # Diske zorla yazma (fsync) aralığı, saniye
+
+logger = logging.getLogger("ResultJournal")
+
+
+def journal_path_for(output_file):
+    """Çıktı Excel dosyası için günlük dosyasının yolunu döndür"""
+    return os.path.splitext(output_file)[0] + ".journal.jsonl"
+
+
+def _plain(value):
+    """numpy/pandas skalerlerini JSON'a yazılabilir Python değerlerine çevir"""
+    if hasattr(value, 'item'):
+        try:
+            return value.item()
+        except (ValueError, AttributeError):
+            pass
+    if isinstance(value, float) and value != value:   # NaN
+        return None
+    return value
+
+
+class ResultJournal:
+    """
+    Satır sonuçları için yalnızca sona eklenen günlük (JSON satırları).
+
+    Her firma tamamlandığında tek bir satır eklenir; Excel dosyası çalışma sırasında yeniden
+    yazılmaz, sonunda (veya istendiğinde) bu günlükten oluşturulur. Satırlar her eklemede
+    işletim sistemine aktarılır, `sync_interval` aralıklarla da diske zorlanır.
+    """
+
+    def __init__(self, path, resume=False, sync_interval=DEFAULT_SYNC_INTERVAL):
+        """resume=True mevcut günlüğün sonuna ekler, aksi halde günlük baştan başlar"""
+        self.path = path
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._last_sync = time.monotonic()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def append(self, row, values, **meta):
+        """
+        Bir satırın sonucunu ekle.
+
+        row: DataFrame satır etiketi, values: {Excel sütunu: değer}, meta: ek bilgiler (firma adı vb.)
+        """
+        record = {key: _plain(value) for key, value in meta.items()}
+        record['row'] = _plain(row)
+        record['values'] = {column: _plain(value) for column, value in values.items()}
+        record['time'] = time.time()
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            if time.monotonic() - self._last_sync >= self.sync_interval:
+                os.fsync(self._file.fileno())
+                self._last_sync = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+
+def read_journal(path):
+    """Günlükteki kayıtları sırayla döndür (yarım kalmış son satır atlanır)"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"{path}:{line_number} okunamadı, atlanıyor")
+
+
+def row_key(row, company_name, website):
+    """Satırı yeniden çalıştırmalarda tanımak için kararlı anahtar (satır etiketi + firma adı + web sitesi)"""
+    website = _plain(website)
+    return (_plain(row), str(company_name).strip(), str(website).strip() if website else '')
+
+
+def run_settings(fields, email_pattern, phone_patterns, search_enabled):
+    """Satır sonucunu etkileyen ayarlar; her kayda yazılır ve devam modunda karşılaştırılır"""
+    return {
+        'fields': sorted(fields),
+        'patterns': [email_pattern or '', [pattern for pattern in (phone_patterns or [])]],
+        'search': bool(search_enabled),
+    }
+
+
+def _settings_cover(record, settings):
+    """Kaydın üretildiği ayarlar şimdiki ayarlarla istenen sonucu kapsıyor mu"""
+    recorded = record.get('settings')
+    if not isinstance(recorded, dict):
+        return False
+    if not set(settings['fields']) <= set(recorded.get('fields') or []):
+        return False
+    if recorded.get('patterns') != settings['patterns']:
+        return False
+    # Web sitesi olmayan satır arama kapalıyken hiç taranmamıştır
+    if settings['search'] and not recorded.get('search') and not record.get('website'):
+        return False
+    return True
+
+
+def completed_keys(path, settings=None):
+    """
+    Günlükte hatasız ve eksiksiz tamamlanmış satırların anahtarlarını döndür.
+
+    Süre sınırı yüzünden kısmi kalan satırlar (partial) tamamlanmış sayılmaz, devam modunda yeniden
+    taranır; yeni sonuç günlükte sonra geldiği için Excel'e o uygulanır. settings (run_settings)
+    verilirse yalnızca bu ayarları kapsayan ayarlarla yazılmış kayıtlar sayılır: daha az alan, farklı
+    e-posta/telefon formatları veya kapalı arama ile tamamlanan satırlar yeniden taranır.
+    """
+    keys = set()
+    for record in read_journal(path):
+        if record.get('error') or record.get('partial') or 'company' not in record:
+            continue
+        if settings is not None and not _settings_cover(record, settings):
+            continue
+        keys.add(row_key(record.get('row'), record['company'], record.get('website')))
+    return keys
+
+
+def apply_journal(df, path, company_column=None):
+    """
+    Günlükteki değerleri DataFrame'e uygula; uygulanan kayıt sayısını döndür.
+
+    company_column verilirse firma adı satırdakiyle eşleşmeyen kayıtlar (ör. girdi dosyası
+    değiştirildiyse) atlanır.
+    """
+    applied = 0
+    prepared = set()
+    for record in read_journal(path):
+        row = record.get('row')
+        if row not in df.index:
+            continue
+        if (company_column and 'company' in record and
+                str(df.at[row, company_column]).strip() != str(record['company']).strip()):
+            continue
+        for column, value in record.get('values', {}).items():
+            if column not in prepared:
+                # Boş okunan sütunlar float tipindedir; metin yazılabilmesi için object'e çevrilir
+                if column not in df.columns:
+                    df[column] = None
+                df[column] = df[column].astype(object)
+                prepared.add(column)
+            df.at[row, column] = value
+        applied += 1
+    return applied
+
+
+def export_workbook(df, journal_path, output_file, company_column=None):
+    """Girdi tablosunun bir kopyasına günlüğü uygulayıp Excel dosyasını yaz"""
+    result = df.copy()
+    applied = apply_journal(result, journal_path, company_column)
+    result.to_excel(output_file, index=False)
+    return applied
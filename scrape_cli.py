@@ -0,0 +1,160 @@
+"""
+Arayüz olmadan toplu tarama (sunucularda çalıştırmak için).
+
+Kullanım:
+    python scrape_cli.py ayarlar.json [--input firmalar.xlsx] [--concurrency 64] [--stats-interval 10]
+
+Ayar dosyası `PipelineConfig` alanlarını içeren bir JSON nesnesidir (örnek: scrape_config.example.json).
+Sonuçlar tamamlandıkça `<çıktı>.journal.jsonl` dosyasına eklenir, işlem bitince (veya Ctrl+C ile
+durdurulunca) Excel dosyası yazılır.
+"""
+import os
+import sys
+import time
+import signal
+import logging
+import argparse
+import threading
+
+from scrape_pipeline import PipelineConfig, ScrapePipeline
+
+DEFAULT_STATS_INTERVAL = 10.0   # İstatistik yazdırma aralığı, saniye
+
+
+class ThroughputStats:
+    """Tamamlanan satır sayaçları ve hız hesabı"""
+
+    def __init__(self, total):
+        self.total = total
+        self.processed = 0
+        self.with_website = 0
+        self.with_data = 0
+        self.errors = 0
+        self.partial = 0
+        self.start_time = time.monotonic()
+        self._last_time = self.start_time
+        self._last_processed = 0
+        self._lock = threading.Lock()
+
+    def record(self, result, found):
+        with self._lock:
+            self.processed += 1
+            self.with_website += bool(result.website)
+            self.with_data += bool(found)
+            self.errors += bool(result.error)
+            self.partial += bool(result.partial)
+
+    def report(self):
+        """Son rapordan bu yana ve başlangıçtan beri geçen süre için hız satırı"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.start_time
+            interval = now - self._last_time
+            recent = (self.processed - self._last_processed) / interval if interval > 0 else 0.0
+            overall = self.processed / elapsed if elapsed > 0 else 0.0
+            self._last_time, self._last_processed = now, self.processed
+            remaining = self.total - self.processed
+            eta = f"{remaining / overall / 60:.1f} dk" if overall > 0 and remaining else "-"
+            return (f"[{elapsed:7.0f}s] {self.processed}/{self.total} satır | "
+                    f"{recent:.2f} satır/s (ortalama {overall:.2f}) | "
+                    f"site: {self.with_website} veri: {self.with_data} hata: {self.errors} kısmi: {self.partial} | kalan süre: {eta}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Firma listesini arayüz olmadan tara")
+    parser.add_argument('config', help="JSON ayar dosyası")
+    parser.add_argument('--input', dest='input_file', help="Girdi Excel dosyası (ayar dosyasındakini geçersiz kılar)")
+    parser.add_argument('--output', dest='output_file', help="Çıktı Excel dosyası")
+    parser.add_argument('--concurrency', type=int, help="Eşzamanlı firma sayısı")
+    parser.add_argument('--per-host', dest='per_host_limit', type=int, help="Site başına eşzamanlı istek")
+    parser.add_argument('--processes', dest='parse_processes', type=int,
+                        help="Sayfaları ayrıştıran süreç sayısı (0: ayrı süreç kullanma)")
+    parser.add_argument('--budget', dest='company_budget', type=float,
+                        help="Firma başına süre sınırı (saniye, 0: sınırsız)")
+    parser.add_argument('--no-resume', dest='resume', action='store_false', default=None,
+                        help="Günlüğü sıfırla ve tüm satırları yeniden tara")
+    parser.add_argument('--stats-interval', type=float, default=DEFAULT_STATS_INTERVAL,
+                        help="İstatistik yazdırma aralığı (saniye, 0: kapalı)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Satır ayrıntılarını konsola da yaz")
+    return parser.parse_args(argv)
+
+
+def load_config(args):
+    config = PipelineConfig.load(args.config)
+    overrides = {key: getattr(args, key) for key in ('input_file', 'output_file', 'concurrency', 'per_host_limit',
+                                                     'parse_processes', 'company_budget', 'resume')}
+    for key, value in overrides.items():
+        if value is not None:
+            setattr(config, key, value)
+    if args.input_file and not args.output_file:
+        config.output_file = PipelineConfig(args.input_file).output_file
+    return config
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Ayrıntılı kayıtlar scraper_log.txt dosyasına gider; konsola yalnızca uyarılar (veya -v ile hepsi)
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(logging.INFO if args.verbose else logging.WARNING)
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logging.getLogger().addHandler(console)
+    logging.getLogger().setLevel(logging.INFO)
+
+    try:
+        config = load_config(args)
+        pipeline = ScrapePipeline(config)
+        jobs = pipeline.prepare()
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+
+    stats = ThroughputStats(len(jobs))
+    processes = 'tüm çekirdekler' if config.parse_processes is None else config.parse_processes
+    print(f"{len(jobs)} satır taranacak ({pipeline.skipped_rows} satır önceki çalışmada tamamlanmış), "
+          f"eşzamanlılık: {config.concurrency}, ayrıştırma süreci: {processes}, çıktı: {config.output_file}", flush=True)
+
+    # İlk Ctrl+C taramayı durdurur ve kısmi sonuçları kaydeder; ikincisi hemen çıkar
+    def interrupt(signum, frame):
+        if not pipeline.running:
+            raise KeyboardInterrupt
+        print("Durduruluyor, tamamlanan sonuçlar kaydediliyor... (hemen çıkmak için tekrar Ctrl+C)", flush=True)
+        pipeline.stop()
+
+    signal.signal(signal.SIGINT, interrupt)
+
+    done = threading.Event()
+
+    def print_stats():
+        while not done.wait(args.stats_interval):
+            print(f"{stats.report()} | eşzamanlılık: {pipeline.concurrency_status()}", flush=True)
+
+    if args.stats_interval > 0:
+        threading.Thread(target=print_stats, daemon=True).start()
+
+    try:
+        output_file = pipeline.run(on_result=stats.record)
+    except Exception as e:
+        print(f"İşlem sırasında hata oluştu: {e}", file=sys.stderr)
+        return 1
+    finally:
+        done.set()
+
+    print(stats.report(), flush=True)
+    if pipeline.running:
+        print(f"İşlem tamamlandı! Sonuçlar kaydedildi: {output_file}")
+        return 0
+    print(f"İşlem durduruldu! Kısmi sonuçlar kaydedildi: {output_file}")
+    return 130
+
+
+if __name__ == "__main__":
+    code = main()
+    if code == 130:
+        # Durdurulduğunda sonuçlar kaydedildi; gönderilmiş son isteklerin iş parçacıkları zaman aşımına
+        # kadar sürebilir, çıkış bunları beklemez
+        logging.shutdown()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+    sys.exit(code)
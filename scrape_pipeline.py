@@ -0,0 +1,294 @@
+import os
+import json
+import inspect
+import logging
+import threading
+
+import pandas as pd
+
+from company_scraper import OUTPUT_FIELDS
+from crawl_engine import CrawlEngine, CompanyJob
+from http_client import configure_cache
+from search_cache import configure_search_cache
+from debug_archive import configure_debug_capture
+from parser_backend import configure_parser, AUTO_BACKEND
+from contact_scanner import DEFAULT_EMAIL_PATTERN, DEFAULT_PHONE_PATTERNS
+from result_journal import ResultJournal, journal_path_for, export_workbook, completed_keys, row_key, run_settings
+
+# Giriş/çıkış sütunları (varsayılan olarak Excel'deki sütun adları bunlarla aynıdır)
+REQUIRED_COLUMNS = ('FirmaAdı', 'WebSitesi')
+COLUMN_NAMES = REQUIRED_COLUMNS + tuple(OUTPUT_FIELDS)
+
+DEFAULT_COMPANY_BUDGET = 60.0   # Firma başına arama + ana sayfa + iletişim sayfası süresi, saniye
+
+
+class PipelineConfig:
+    """
+    Tarama ayarları. Arayüzdeki seçeneklerin karşılığıdır; komut satırında JSON dosyasından okunur.
+
+    columns: {sütun: Excel sütun adı} eşleştirmesi, fields: doldurulacak sütunlar (varsayılan: hepsi),
+    result_index: kullanılacak arama sonucu sırası (0 = ilk sonuç), parse_processes: sayfaları
+    ayrıştıran süreç sayısı (0: indirme iş parçacıklarında, None: tüm çekirdekler), adaptive_concurrency:
+    eşzamanlılığı gecikme ve hata oranına göre ayarla (concurrency üst sınır olur), company_budget: firma
+    başına toplam süre sınırı (saniye, 0: sınırsız).
+    """
+
+    def __init__(self, input_file, output_file=None, columns=None, fields=None,
+                 email_pattern=DEFAULT_EMAIL_PATTERN, phone_patterns=DEFAULT_PHONE_PATTERNS,
+                 result_index=0, search_enabled=True, concurrency=16, per_host_limit=2, delay=2.0,
+                 cache=True, debug_capture=False, parser=AUTO_BACKEND, resume=True, parse_processes=0,
+                 adaptive_concurrency=False, company_budget=DEFAULT_COMPANY_BUDGET):
+        self.input_file = input_file
+        self.output_file = output_file or os.path.splitext(input_file)[0] + "_updated.xlsx"
+        self.columns = {name: name for name in COLUMN_NAMES}
+        self.columns.update(columns or {})
+        self.fields = list(OUTPUT_FIELDS) if fields is None else [name for name in OUTPUT_FIELDS if name in fields]
+        self.email_pattern = email_pattern
+        self.phone_patterns = [pattern for pattern in (phone_patterns or []) if pattern.strip()]
+        self.result_index = int(result_index)
+        self.search_enabled = bool(search_enabled)
+        self.concurrency = int(concurrency)
+        self.per_host_limit = int(per_host_limit)
+        self.delay = float(delay)
+        self.cache = bool(cache)
+        self.debug_capture = bool(debug_capture)
+        self.parser = parser
+        self.resume = bool(resume)
+        self.parse_processes = parse_processes
+        self.adaptive_concurrency = bool(adaptive_concurrency)
+        self.company_budget = float(company_budget or 0)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Sözlükten ayar oluştur; bilinmeyen anahtarlar ValueError verir"""
+        unknown = set(data) - set(inspect.signature(cls).parameters)
+        if unknown:
+            raise ValueError(f"Bilinmeyen ayar(lar): {', '.join(sorted(unknown))}")
+        if 'input_file' not in data:
+            raise ValueError("input_file ayarı gerekli")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path):
+        """JSON ayar dosyasını oku; göreli dosya yolları ayar dosyasının klasörüne göre çözülür"""
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        base = os.path.dirname(os.path.abspath(path))
+        for key in ('input_file', 'output_file'):
+            if data.get(key) and not os.path.isabs(data[key]):
+                data[key] = os.path.join(base, data[key])
+        return cls.from_dict(data)
+
+
+class ScrapePipeline:
+    """
+    Excel'den okuma, iş listesi, eşzamanlı tarama, sonuç günlüğü ve Excel çıktısı.
+
+    Arayüz (`gui_scraper.py`) ve komut satırı (`scrape_cli.py`) aynı akışı kullanır; arayüze özgü
+    güncellemeler on_start / on_result geri çağrılarıyla yapılır.
+    """
+
+    def __init__(self, config, logger=None):
+        self.config = config
+        self.logger = logger or logging.getLogger("ScrapePipeline")
+        self.running = True
+        self.df = None
+        self.jobs = []
+        self.skipped_rows = 0
+        self.journal = None
+        self.engine = None
+        # Ara kayıt ve bitişteki kayıt aynı Excel dosyasını aynı anda yazmaz
+        self._export_lock = threading.Lock()
+
+    @property
+    def output_file(self):
+        return self.config.output_file
+
+    def prepare(self):
+        """
+        Excel dosyasını oku ve işlenecek satırları hazırla.
+
+        Gerekli sütunlar yoksa ValueError verir. Devam modunda günlükte tamamlanmış satırlar atlanır.
+        """
+        columns = self.config.columns
+        df = pd.read_excel(self.config.input_file)
+        self.logger.info(f"Dosya başarıyla okundu: {len(df)} satır.")
+
+        missing_columns = [columns[name] for name in REQUIRED_COLUMNS if columns[name] not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Excel dosyasında gerekli sütunlar bulunamadı: {', '.join(missing_columns)}")
+
+        if self.config.fields:
+            self.logger.info(f"Çıkarılacak bilgiler: {', '.join(self.config.fields)}")
+        else:
+            self.logger.info("Hiçbir bilgi sütunu seçilmedi, yalnızca web siteleri aranacak")
+
+        # Doldurulacak sütunlar yoksa ekle
+        for name in self.config.fields:
+            if columns[name] not in df.columns:
+                df[columns[name]] = None
+
+        # Önceki çalışmada tamamlanan satırlar (günlükten)
+        journal_path = journal_path_for(self.output_file)
+        done_keys = completed_keys(journal_path, self.run_settings()) if self.config.resume else set()
+
+        jobs = []
+        skipped_rows = 0
+        for idx, row in df.iterrows():
+            company_name = row[columns['FirmaAdı']]
+            website = row[columns['WebSitesi']]
+
+            # Boş firma adlarını atla
+            if pd.isna(company_name) or not str(company_name).strip():
+                self.logger.warning(f"Satır {idx+2}: Firma adı boş, atlanıyor.")
+                continue
+
+            if pd.isna(website) or not str(website).strip():
+                website = None
+            if row_key(idx, company_name, website) in done_keys:
+                skipped_rows += 1
+                continue
+            jobs.append(CompanyJob(idx, company_name, website))
+
+        if skipped_rows:
+            self.logger.info(f"Önceki çalışmada tamamlanan {skipped_rows} satır atlanıyor, kalan: {len(jobs)}")
+
+        self.df = df
+        self.jobs = jobs
+        self.skipped_rows = skipped_rows
+        return jobs
+
+    def run_settings(self):
+        """Günlük kayıtlarına yazılan ve devam modunda karşılaştırılan ayarlar"""
+        config = self.config
+        return run_settings(config.fields, config.email_pattern, config.phone_patterns, config.search_enabled)
+
+    def result_values(self, result):
+        """Bir sonucun Excel'e yazılacak değerlerini ve bulunan bilgi adlarını döndür"""
+        columns = self.config.columns
+        values = {}
+        found = []
+        if result.searched:
+            values[columns['WebSitesi']] = result.website
+        if result.website:
+            for name in self.config.fields:
+                if result.data.get(name):
+                    values[columns[name]] = result.data[name]
+                    found.append(name)
+        return values, found
+
+    def _log_start(self, job):
+        self.logger.info(f"İşleniyor: {job.company_name}")
+        if not job.website and self.config.search_enabled:
+            self.logger.info(f"{job.company_name} için Google araması yapılıyor... ({self.config.result_index+1}. sonuç istenmiş)")
+        elif job.website:
+            self.logger.info(f"{job.company_name} için web sitesi taranıyor: {job.website}")
+
+    def _record(self, result, found):
+        company_name = result.job.company_name
+        if result.searched:
+            self.logger.info(f"Bulunan site: {result.website}")
+        if not result.website:
+            self.logger.warning(f"{company_name} için web sitesi bulunamadı.")
+        elif found:
+            self.logger.info(f"{company_name} - bulunan bilgiler: {', '.join(found)}")
+        else:
+            self.logger.info(f"{company_name} - hiç veri bulunamadı")
+        if result.partial:
+            self.logger.warning(f"{company_name} - kısmi sonuç: {result.partial}")
+
+    def run(self, on_start=None, on_result=None, on_limit_change=None):
+        """
+        Hazırlanan satırları tara, sonuçları günlüğe ekle ve sonunda Excel dosyasını yaz.
+
+        on_start(job) bir firma başlarken, on_result(result, found) sonuç günlüğe yazıldıktan
+        sonra, on_limit_change(status) eşzamanlılık limiti değiştiğinde çağrılır.
+        Çıktı dosyasının yolunu döndürür.
+        """
+        config = self.config
+        if self.df is None:
+            self.prepare()
+
+        # Disk önbelleğini ve ayrıştırıcıyı ayarla
+        configure_cache(enabled=config.cache)
+        configure_search_cache(enabled=config.cache)
+        configure_debug_capture(enabled=config.debug_capture)
+        parser_name = configure_parser(config.parser)
+        self.logger.info(f"HTML ayrıştırıcı: {parser_name}")
+
+        # Sonuç günlüğünü aç
+        self.journal = ResultJournal(journal_path_for(self.output_file), resume=config.resume)
+        self.logger.info(f"Sonuçlar günlüğe yazılıyor: {self.journal.path}")
+        settings = self.run_settings()
+
+        def start(job):
+            self._log_start(job)
+            if on_start:
+                on_start(job)
+
+        def record(result):
+            values, found = self.result_values(result)
+            self._record(result, found)
+            # Sonucu günlüğe ekle (Excel dosyası sonunda günlükten oluşturulur)
+            self.journal.append(
+                result.job.index, values,
+                company=result.job.company_name, website=result.job.website, error=result.error,
+                partial=result.partial, settings=settings
+            )
+            if on_result:
+                on_result(result, found)
+
+        def limit_changed(controller, old, new, reason):
+            if on_limit_change:
+                on_limit_change(self.engine.concurrency_status())
+
+        try:
+            self.engine = CrawlEngine(
+                max_concurrency=config.concurrency,
+                per_host_limit=config.per_host_limit,
+                search_enabled=config.search_enabled,
+                result_index=config.result_index,
+                email_pattern=config.email_pattern,
+                phone_patterns=config.phone_patterns,
+                search_delay=config.delay,
+                site_delay=config.delay,
+                fields=config.fields,
+                parse_processes=config.parse_processes,
+                adaptive=config.adaptive_concurrency,
+                company_budget=config.company_budget,
+                on_limit_change=limit_changed
+            )
+            if on_limit_change:
+                on_limit_change(self.engine.concurrency_status())
+            if self.running:
+                self.engine.run(self.jobs, on_start=start, on_result=record)
+                if self.engine.deduplicated_searches:
+                    self.logger.info(f"Tekrarlanan firma adları için {self.engine.deduplicated_searches} arama atlandı")
+                if self.engine.deduplicated_scrapes:
+                    self.logger.info(f"Aynı web sitesini paylaşan {self.engine.deduplicated_scrapes} satır tek taramadan "
+                                     f"dolduruldu, {self.engine.saved_fetches} sayfa isteği atlandı")
+        finally:
+            # Excel dosyasını günlükten oluştur (durdurulduğunda da kısmi sonuçlar yazılır)
+            self.journal.close()
+            self.export()
+        return self.output_file
+
+    def concurrency_status(self):
+        return self.engine.concurrency_status() if self.engine else "-"
+
+    def export(self):
+        """O ana kadar günlüğe yazılan sonuçlarla Excel dosyasını oluştur; uygulanan satır sayısını döndür"""
+        if self.journal is None:
+            return 0
+        with self._export_lock:
+            return export_workbook(self.df, self.journal.path, self.output_file, self.config.columns['FirmaAdı'])
+
+    def stop(self):
+        """Taramayı durdur; devam eden satırlar bırakılır ve o ana kadarki sonuçlar hemen kaydedilir"""
+        self.running = False
+        if self.engine:
+            self.engine.stop()
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
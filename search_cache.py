@@ -0,0 +1,123 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+import logging
+from http_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SEARCH_TTL = 30 * 24 * 3600      # Bulunan web sitesi bu süre boyunca yeniden aranmaz
+DEFAULT_NEGATIVE_TTL = 24 * 3600         # Sonuç bulunamayan aramalar daha kısa süre saklanır
+
+_TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+
+def normalize_company_name(company_name):
+    """Firma adını önbellek anahtarı için sadeleştir (küçük harf, noktalama ve fazla boşluk yok)"""
+    if not company_name:
+        return ""
+    name = str(company_name).translate(_TURKISH_LOWER).lower()
+    name = re.sub(r'[^\w\s]', ' ', name)
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+class SearchCacheEntry:
+    """Bir firma araması için saklanan sonuç"""
+
+    def __init__(self, website, candidates, searched_at):
+        self.website = website
+        self.candidates = candidates
+        self.searched_at = searched_at
+
+
+class SearchCache:
+    """
+    Arama motoru sonuçları için kalıcı önbellek.
+
+    Anahtar, sadeleştirilmiş firma adı ve istenen sonuç sırasıdır. Seçilen web sitesi ile
+    birlikte ayrıştırılmış aday listesi de saklanır.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_SEARCH_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "search.sqlite"),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS searches (
+                name TEXT,
+                result_index INTEGER,
+                website TEXT,
+                candidates TEXT,
+                searched_at REAL,
+                PRIMARY KEY (name, result_index)
+            )
+        """)
+
+    def get(self, company_name, result_index):
+        """Süresi dolmamış kaydı döndür (yoksa None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT website, candidates, searched_at FROM searches WHERE name = ? AND result_index = ?",
+                (normalize_company_name(company_name), result_index)
+            ).fetchone()
+        if row is None:
+            return None
+
+        website, candidates, searched_at = row
+        ttl = self.ttl if website else self.negative_ttl
+        if time.time() - searched_at >= ttl:
+            return None
+        return SearchCacheEntry(website, json.loads(candidates), searched_at)
+
+    def put(self, company_name, result_index, website, candidates):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (name, result_index, website, candidates, searched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (normalize_company_name(company_name), result_index, website, json.dumps(candidates), time.time())
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_search_cache = None
+_search_cache_enabled = True
+_search_cache_lock = threading.Lock()
+
+
+def configure_search_cache(enabled=True, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_SEARCH_TTL,
+                           negative_ttl=DEFAULT_NEGATIVE_TTL):
+    """Arama önbelleğini aç/kapat veya ayarlarını değiştir"""
+    global _search_cache, _search_cache_enabled
+    with _search_cache_lock:
+        _search_cache_enabled = enabled
+        old_cache, _search_cache = _search_cache, None
+        if enabled:
+            _search_cache = SearchCache(cache_dir, ttl=ttl, negative_ttl=negative_ttl)
+    if old_cache is not None:
+        old_cache.close()
+
+
+def get_search_cache():
+    """Paylaşılan arama önbelleğini döndür (kapalıysa None)"""
+    global _search_cache
+    if _search_cache is None and _search_cache_enabled:
+        with _search_cache_lock:
+            if _search_cache is None and _search_cache_enabled:
+                try:
+                    _search_cache = SearchCache()
+                except Exception as e:
+                    logging.getLogger("SearchCache").error(f"Arama önbelleği açılamadı: {e}")
+                    return None
+    return _search_cache
@@ -0,0 +1,190 @@
+import re
+from contact_scanner import normalize_phone
+
+# Firma bilgisi taşıyan schema.org türleri (küçük harfle); "...Organization", "...Business" ve "...Store"
+# ile biten türler de kabul edilir
+_ORGANIZATION_TYPES = {
+    'organization', 'corporation', 'localbusiness', 'professionalservice', 'ngo', 'store',
+    'foodestablishment', 'restaurant', 'hotel', 'legalservice', 'financialservice', 'travelagency'
+}
+_ORGANIZATION_SUFFIXES = ('organization', 'business', 'store')
+
+# Adres parçaları (sıra önemlidir)
+_ADDRESS_PARTS = ('streetAddress', 'addressLocality', 'addressRegion', 'postalCode')
+
+# OpenGraph / Facebook işletme meta etiketleri
+_META_FIELDS = {
+    'name': ('og:site_name', 'og:title'),
+    'description': ('og:description',),
+    'email': ('og:email', 'business:contact_data:email'),
+    'phone': ('og:phone_number', 'business:contact_data:phone_number'),
+}
+_META_ADDRESS = (
+    ('og:street-address', 'business:contact_data:street_address'),
+    ('og:locality', 'business:contact_data:locality'),
+    ('og:region', 'business:contact_data:region'),
+    ('og:postal-code', 'business:contact_data:postal_code'),
+)
+
+_MAX_JSON_LD_DEPTH = 8
+
+
+def _schema_type(value):
+    """'https://schema.org/LocalBusiness', 'schema:Store' gibi değerlerden tür adını çıkar"""
+    if isinstance(value, list):
+        return [name for item in value for name in _schema_type(item)]
+    if not isinstance(value, str):
+        return []
+    return [re.split(r'[/:#]', part)[-1].lower() for part in value.split() if part]
+
+
+def _is_organization(type_value):
+    return any(name in _ORGANIZATION_TYPES or name.endswith(_ORGANIZATION_SUFFIXES)
+               for name in _schema_type(type_value))
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _clean(value):
+    return re.sub(r'\s+', ' ', value).strip() if isinstance(value, str) else None
+
+
+def _format_address(value):
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        parts = [_clean(str(value[key])) for key in _ADDRESS_PARTS if value.get(key)]
+        return ' '.join(part for part in parts if part) or None
+    return _clean(value) or None
+
+
+def _description(value):
+    """Yalnızca anlamlı uzunluktaki açıklamaları kabul et (meta description ile aynı eşik)"""
+    value = _clean(value)
+    return value if value and len(value) > 10 else None
+
+
+def _add_field(result, name, value):
+    """Alan boşsa doldur (önceki kaynaklar önceliklidir)"""
+    if value and not result.get(name):
+        result[name] = value
+
+
+def _add_contacts(result, phones, emails, same_as):
+    # Ham telefon metinleri kullanıcının telefon formatlarıyla yeniden taranabilsin diye saklanır
+    _add_field(result, 'phone_texts', [str(p).strip() for p in phones if p])
+    phones = [phone for phone in (normalize_phone(str(p)) for p in phones) if phone]
+    emails = [str(e).replace('mailto:', '').strip() for e in emails]
+    _add_field(result, 'phones', list(dict.fromkeys(phones)))
+    _add_field(result, 'emails', list(dict.fromkeys(e for e in emails if '@' in e)))
+    _add_field(result, 'same_as', [str(url) for url in same_as if url])
+
+
+def _json_ld_nodes(data, depth=0):
+    """JSON-LD içindeki tüm nesneleri (@graph ve iç içe olanlar dahil) üret"""
+    if depth > _MAX_JSON_LD_DEPTH:
+        return
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_nodes(item, depth + 1)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from _json_ld_nodes(value, depth + 1)
+
+
+def _from_json_ld(doc, result):
+    for block in doc.json_ld:
+        for node in _json_ld_nodes(block):
+            if not _is_organization(node.get('@type')):
+                continue
+            contact_points = [point for point in _as_list(node.get('contactPoint')) if isinstance(point, dict)]
+            _add_field(result, 'name', _clean(node.get('name')))
+            _add_field(result, 'description', _description(node.get('description')))
+            _add_field(result, 'address', _format_address(node.get('address')))
+            _add_contacts(
+                result,
+                _as_list(node.get('telephone')) + [p.get('telephone') for p in contact_points if p.get('telephone')],
+                _as_list(node.get('email')) + [p.get('email') for p in contact_points if p.get('email')],
+                _as_list(node.get('sameAs'))
+            )
+
+
+def _item_properties(doc, scope):
+    """Bir microdata öğesinin özelliklerini (iç içe öğelerin özellikleri hariç) topla"""
+    properties = {}
+    index = scope.index + 1
+    while index <= scope.last:
+        element = doc.elements[index]
+        for name in (element.get('itemprop') or '').split():
+            properties.setdefault(name, []).append(element)
+        # İç içe öğenin özellikleri kendisine aittir
+        index = element.last + 1 if 'itemscope' in element.attrs else index + 1
+    return properties
+
+
+def _item_value(doc, element):
+    if element.tag == 'meta':
+        return element.get('content')
+    if element.tag in ('a', 'link', 'area'):
+        return element.get('href')
+    if element.tag == 'time':
+        return element.get('datetime') or doc.element_text(element, separator=' ')
+    return doc.element_text(element, separator=' ')
+
+
+def _from_microdata(doc, result):
+    for scope in doc.elements:
+        if 'itemscope' not in scope.attrs or not _is_organization(scope.get('itemtype')):
+            continue
+        properties = _item_properties(doc, scope)
+        values = {name: [_item_value(doc, e) for e in elements] for name, elements in properties.items()}
+
+        address = None
+        for element in properties.get('address', []):
+            if 'itemscope' in element.attrs:
+                parts = _item_properties(doc, element)
+                address = _format_address({key: _item_value(doc, parts[key][0]) for key in _ADDRESS_PARTS if key in parts})
+            else:
+                address = _format_address(_item_value(doc, element))
+            if address:
+                break
+
+        _add_field(result, 'name', _clean((values.get('name') or [None])[0]))
+        _add_field(result, 'description', _description((values.get('description') or [None])[0]))
+        _add_field(result, 'address', address)
+        _add_contacts(result, values.get('telephone', []), values.get('email', []), values.get('sameAs', []))
+
+
+def _from_meta(doc, result):
+    meta = doc.meta
+
+    def first(keys):
+        return next((_clean(meta[key]) for key in keys if meta.get(key)), None)
+
+    _add_field(result, 'name', first(_META_FIELDS['name']))
+    _add_field(result, 'description', _description(first(_META_FIELDS['description'])))
+    _add_field(result, 'address', ' '.join(part for part in (first(keys) for keys in _META_ADDRESS) if part) or None)
+    phone, email = first(_META_FIELDS['phone']), first(_META_FIELDS['email'])
+    _add_contacts(result, [phone] if phone else [], [email] if email else [], [])
+
+
+def extract_structured_data(doc):
+    """
+    Sayfadaki yapılandırılmış veriden firma bilgilerini çıkar.
+
+    Sırasıyla JSON-LD (Organization / LocalBusiness ve alt türleri), microdata ve OpenGraph meta
+    etiketleri okunur; bir alan ilk dolduran kaynaktan alınır. Yalnızca bulunan alanlar döner:
+    name, description, address, phones, phone_texts (sayfadaki ham telefon metinleri), emails, same_as.
+    """
+    result = {}
+    if doc.json_ld:
+        _from_json_ld(doc, result)
+    _from_microdata(doc, result)
+    _from_meta(doc, result)
+    return {key: value for key, value in result.items() if value}
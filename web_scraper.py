@@ -1,21 +1,21 @@
-import requests
 import os
 import json
 import logging
-from bs4 import BeautifulSoup
+from parser_backend import make_soup
 from typing import Dict, Any, Optional
-from gemini_client import GeminiClient
+from gemini_client import get_client
+from http_client import http_get
 
 class WebScraper:
     def __init__(self):
-        # GeminiClient'ı kullanarak API yapılandırması
-        self.gemini_client = GeminiClient()
+        # Süreç genelinde paylaşılan istemci (anahtar ve promptlar bir kez yüklenir)
+        self.gemini_client = get_client()
         # Logger oluştur
         self.logger = logging.getLogger("WebScraper")
         
     def load_prompts(self) -> None:
         """JSON dosyasından tüm promptları yükle"""
-        # GeminiClient zaten promptları yükleyecek
+        # Promptlar paylaşılır; prompts.json değiştiyse yeniden yüklenir
         self.gemini_client.load_prompts()
             
     def configure(self, api_key: str, model: str = "gemini-1.0-pro") -> None:
@@ -33,7 +33,7 @@ class WebScraper:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_get(url, headers=headers, timeout=10)
             response.raise_for_status()
             return response.text
         except Exception as e:
@@ -47,7 +47,7 @@ class WebScraper:
             
         try:
             # Basit HTML temizleme ve kısaltma
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = make_soup(html_content)
             
             # Meta tag'lerden açıklama ve anahtar kelimeleri çıkar
             meta_description = ""